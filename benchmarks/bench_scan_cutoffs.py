@@ -0,0 +1,53 @@
+"""Benchmark FuzzySearcher scans as min_r1 (the scan score cutoff) rises.
+
+Higher thresholds let rapidfuzz stop scoring windows early,
+so scans should get faster as min_r1 increases.
+
+Run with:
+    python benchmarks/bench_scan_cutoffs.py
+"""
+import random
+import timeit
+
+import spacy
+
+from spaczz.search import FuzzySearcher
+
+WORDS = [
+    "patient",
+    "was",
+    "prescribed",
+    "zithromax",
+    "tablets",
+    "and",
+    "advair",
+    "for",
+    "the",
+    "infection",
+    "symptoms",
+    "improved",
+]
+
+
+def main() -> None:
+    """Times scans over a 5k token doc at increasing thresholds."""
+    random.seed(0)
+    nlp = spacy.blank("en")
+    doc = nlp(" ".join(random.choice(WORDS) for _ in range(5000)))
+    query = nlp("zithromax tablet")
+    searcher = FuzzySearcher(nlp.vocab)
+    print(f"{'min_r1':>6} {'hits':>6} {'seconds':>8}")
+    for min_r1 in (0, 25, 50, 75, 90):
+        hits = searcher._scan(doc, query, min_r1) or {}
+        seconds = min(
+            timeit.repeat(
+                lambda min_r1=min_r1: searcher._scan(doc, query, min_r1),
+                number=5,
+                repeat=3,
+            )
+        )
+        print(f"{min_r1:>6} {len(hits):>6} {seconds / 5:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark single doc matcher latency as n_threads increases.
+
+Patterns are split across threads inside one matcher call. Regexes are
+matched without holding the GIL, so RegexMatcher latency should drop with
+more threads. FuzzyMatcher only scales if the installed rapidfuzz
+releases the GIL while scoring.
+
+Run with:
+    python benchmarks/bench_threads.py
+"""
+import random
+import timeit
+
+import spacy
+
+from spaczz.matcher import FuzzyMatcher, RegexMatcher
+
+WORDS = [
+    "patient",
+    "was",
+    "prescribed",
+    "zithromax",
+    "tablets",
+    "and",
+    "advair",
+    "for",
+    "the",
+    "infection",
+    "symptoms",
+    "improved",
+]
+
+
+def main() -> None:
+    """Times one call over a 5k token doc with 16 patterns per matcher."""
+    random.seed(0)
+    nlp = spacy.blank("en")
+    doc = nlp.make_doc(" ".join(random.choice(WORDS) for _ in range(5000)))
+    pairs = [(random.choice(WORDS), random.choice(WORDS)) for _ in range(16)]
+    print(f"{'matcher':>8} {'threads':>7} {'seconds':>8}")
+    for n_threads in (1, 2, 4, 8):
+        regex_matcher = RegexMatcher(nlp.vocab, n_threads=n_threads)
+        fuzzy_matcher = FuzzyMatcher(nlp.vocab, n_threads=n_threads)
+        for i, (first, second) in enumerate(pairs):
+            regex_matcher.add(f"R{i}", [f"({first}){{e<=2}} {second}"])
+            fuzzy_matcher.add(f"F{i}", [nlp.make_doc(f"{first} {second}")])
+        for name, matcher in (("regex", regex_matcher), ("fuzzy", fuzzy_matcher)):
+            seconds = min(
+                timeit.repeat(lambda matcher=matcher: matcher(doc), number=1, repeat=3)
+            )
+            print(f"{name:>8} {n_threads:>7} {seconds:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
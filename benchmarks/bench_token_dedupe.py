@@ -0,0 +1,60 @@
+"""Benchmark deduplicating TokenSearcher.match results.
+
+A permissive pattern matches nearly every window of a long doc, and
+repeated token texts produce many duplicate matches. Checking each
+match against every earlier one is quadratic in the number of windows.
+Keying the matches by tuple keeps first-seen order in linear time.
+TokenMatcher does not call TokenSearcher.match, so it is unaffected.
+
+Run with:
+    python benchmarks/bench_token_dedupe.py
+"""
+import random
+import string
+import timeit
+from typing import List, Optional, Tuple
+
+import spacy
+
+from spaczz.process import n_wise
+from spaczz.search import TokenSearcher
+
+Match = List[Optional[Tuple[str, str]]]
+
+
+def quadratic_dedupe(matches: List[Match]) -> List[Match]:
+    """The list scan TokenSearcher.match used to dedupe with."""
+    return [i for n, i in enumerate(matches) if i not in matches[:n]]
+
+
+def main() -> None:
+    """Times match() and the old dedupe on docs up to 10k windows."""
+    random.seed(0)
+    nlp = spacy.blank("en")
+    searcher = TokenSearcher(nlp.vocab)
+    terms = [
+        "".join(random.choice(string.ascii_lowercase) for _ in range(4))
+        for _ in range(200)
+    ]
+    pattern = [{"LOWER": {"FREGEX": "[a-z]+"}}, {"LOWER": {"FREGEX": "[a-z]+"}}]
+    predicates = searcher.compile_pattern(pattern)
+    funcs = {pred: searcher.predicate_func(pred) for pred in predicates if pred}
+    print(f"{'windows':>8} {'unique':>7} {'match':>8} {'quadratic':>10}")
+    for n_windows in (2500, 5000, 10000):
+        doc = nlp(" ".join(random.choice(terms) for _ in range(n_windows + 1)))
+        matches = [
+            searcher._iter_pattern(seq, predicates, funcs)
+            for seq in n_wise(doc, len(pattern))
+        ]
+        unique = len(searcher.match(doc, pattern))
+        linear = min(
+            timeit.repeat(lambda: searcher.match(doc, pattern), number=1, repeat=3)
+        )
+        quadratic = min(
+            timeit.repeat(lambda: quadratic_dedupe(matches), number=1, repeat=3)
+        )
+        print(f"{n_windows:>8} {unique:>7} {linear:>8.3f} {quadratic:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,14 @@ from typing import (
     Callable,
     DefaultDict,
     Dict,
+    FrozenSet,
     Generator,
     Iterable,
     List,
+    NamedTuple,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Union,
 )
@@ -21,6 +25,35 @@ from spacy.vocab import Vocab
 
 from ..exceptions import KwargsWarning
 from ..search import _PhraseSearcher
+from ..search._phrasesearcher import MatchSettings
+from ..util import pipe_matches, thread_map_chunks
+
+
+class PatternRecord(NamedTuple):
+    """A pattern compiled once by `_PhraseMatcher.add()` for matching.
+
+    Attributes:
+        key: (label, index) pair identifying the pattern.
+        pattern: The pattern `Doc` object.
+        text: The pattern text, lower-cased if the pattern ignores case.
+        n_tokens: Number of tokens in the pattern.
+        n_chars: Number of characters in the pattern text.
+        qgrams: Distinct lower-cased character q-grams of the pattern text,
+            if the matcher indexes them.
+        kwargs: The pattern's match settings, or the matcher defaults
+            if it has none.
+        settings: kwargs split by the searcher, read by matcher fast paths.
+            `match_many()` is still given kwargs and splits them itself.
+    """
+
+    key: Tuple[str, int]
+    pattern: Doc
+    text: str
+    n_tokens: int
+    n_chars: int
+    qgrams: FrozenSet[str]
+    kwargs: Dict[str, Any]
+    settings: MatchSettings
 
 
 class _PhraseMatcher:
@@ -32,6 +65,8 @@ class _PhraseMatcher:
     Attributes:
         defaults: Keyword arguments to be used as default matching settings.
             See `_PhraseSearcher` documentation for details.
+        n_threads: Number of threads patterns are split across
+            when the matcher is called.
         name: Class attribute - the name of the matcher.
         type: The kind of matcher object.
         _callbacks:
@@ -41,11 +76,13 @@ class _PhraseMatcher:
             Patterns added to the matcher. Contains patterns
             and kwargs that should be used during matching
             for each labels added.
+        _records:
+            The compiled `PatternRecord` of each pattern, by label.
     """
 
     name = "_phrase_matcher"
 
-    def __init__(self, vocab: Vocab, **defaults: Any) -> None:
+    def __init__(self, vocab: Vocab, n_threads: int = 1, **defaults: Any) -> None:
         """Initializes the base phrase matcher with the given defaults.
 
         Args:
@@ -55,12 +92,18 @@ class _PhraseMatcher:
                 spaczz matchers are currently pure
                 Python and do not share vocabulary
                 with spaCy pipelines.
+            n_threads: Number of threads to split patterns across
+                when the matcher is called. Helps latency on large docs
+                when the searcher releases the GIL while scoring.
+                Matches are the same for any number of threads.
+                Default is `1`.
             **defaults: Keyword arguments that will
                 be used as default matching settings.
                 These arguments will become the new defaults for matching.
                 See `_PhraseSearcher` documentation for details.
         """
         self.defaults = defaults
+        self.n_threads = n_threads
         self.type = "_phrase"
         self._callbacks: Dict[
             str,
@@ -74,6 +117,7 @@ class _PhraseMatcher:
         self._patterns: DefaultDict[str, DefaultDict[str, Any]] = defaultdict(
             lambda: defaultdict(list)
         )
+        self._records: Dict[str, List[PatternRecord]] = {}
         self._searcher = _PhraseSearcher(vocab=vocab)
 
     def __call__(self, doc: Doc) -> List[Tuple[str, int, int, int]]:
@@ -95,18 +139,13 @@ class _PhraseMatcher:
             >>> matcher(doc)
             [('NAME', 0, 2, 100)]
         """
+        records = [record for records in self._records.values() for record in records]
         matches = set()
-        for label, patterns in self._patterns.items():
-            for pattern, kwargs in zip(patterns["patterns"], patterns["kwargs"]):
-                if not kwargs:
-                    kwargs = self.defaults
-                matches_wo_label = self._searcher.match(doc, pattern, **kwargs)
-                if matches_wo_label:
-                    matches_w_label = [
-                        (label,) + match_wo_label for match_wo_label in matches_wo_label
-                    ]
-                    for match in matches_w_label:
-                        matches.add(match)
+        for record, matches_wo_label in zip(
+            records, self._match_patterns(doc, records)
+        ):
+            for match_wo_label in matches_wo_label:
+                matches.add((record.key[0],) + match_wo_label)
         if matches:
             sorted_matches = sorted(matches, key=lambda x: (x[1], -x[2] - x[1]))
             for i, (label, _start, _end, _ratio) in enumerate(sorted_matches):
@@ -256,6 +295,8 @@ class _PhraseMatcher:
                 self._patterns[label]["kwargs"].append(kwarg)
             else:
                 raise TypeError("Kwargs must be a list of dictionaries.")
+            records = self._records.setdefault(label, [])
+            records.append(self._compile_pattern((label, len(records)), pattern, kwarg))
         self._callbacks[label] = on_match
 
     def remove(self, label: str) -> None:
@@ -280,17 +321,97 @@ class _PhraseMatcher:
         try:
             del self._patterns[label]
             del self._callbacks[label]
+            del self._records[label]
         except KeyError:
             raise ValueError(
                 f"The label: {label} does not exist within the matcher rules."
             )
 
+    def _compile_pattern(
+        self, key: Tuple[str, int], pattern: Doc, kwargs: Dict[str, Any]
+    ) -> PatternRecord:
+        """Compiles a pattern and its kwargs into a `PatternRecord`.
+
+        Child classes can override this to precompute more of the pattern.
+
+        Args:
+            key: (label, index) pair identifying the pattern.
+            pattern: The pattern `Doc` object.
+            kwargs: The match settings added with the pattern.
+
+        Returns:
+            The pattern's `PatternRecord`.
+        """
+        kwargs = kwargs or self.defaults
+        text = pattern.text
+        if kwargs.get("ignore_case", True):
+            text = text.lower()
+        return PatternRecord(
+            key=key,
+            pattern=pattern,
+            text=text,
+            n_tokens=len(pattern),
+            n_chars=len(text),
+            qgrams=frozenset(),
+            kwargs=kwargs,
+            settings=self._searcher._split_kwargs(**kwargs),
+        )
+
+    def _candidates(
+        self, doc: Doc, records: List[PatternRecord]
+    ) -> Optional[List[Optional[Set[int]]]]:
+        """Returns the doc windows worth searching for each pattern.
+
+        The base implementation does no pre-filtering.
+        Child classes can override this to narrow the initial search.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+
+        Returns:
+            `None`, or one set of window start indices
+            (or `None` for all windows) per record.
+        """
+        return None
+
+    def _match_patterns(
+        self,
+        doc: Doc,
+        records: List[PatternRecord],
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+    ) -> List[List[Tuple[int, int, int]]]:
+        """Searches doc for each pattern, split across `n_threads` threads.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+            candidates: Window start indices to search for each pattern.
+                Default is `None`, which uses `_candidates()`.
+
+        Returns:
+            The (start, end, ratio) matches of each pattern.
+        """
+        if candidates is None:
+            candidates = self._candidates(doc, records)
+
+        def match_chunk(indices: Sequence[int]) -> List[List[Tuple[int, int, int]]]:
+            return self._searcher.match_many(
+                doc,
+                [records[i].pattern for i in indices],
+                [records[i].kwargs for i in indices],
+                [candidates[i] for i in indices] if candidates else None,
+            )
+
+        return thread_map_chunks(match_chunk, range(len(records)), self.n_threads)
+
     def pipe(
         self,
         stream: Iterable[Doc],
         batch_size: int = 1000,
         return_matches: bool = False,
         as_tuples: bool = False,
+        n_process: int = 1,
     ) -> Generator[Any, None, None]:
         """Match a stream of `Doc` objects, yielding them in turn.
 
@@ -305,6 +426,11 @@ class _PhraseMatcher:
                 If both return_matches and as_tuples are `True`,
                 the output will be a sequence of ((doc, matches), context) tuples.
                 Default is `False`.
+            n_process: Number of processes to match with.
+                With more than one, batches of batch_size docs are matched
+                by worker processes and the yielded docs are copies
+                rebuilt from the workers' results.
+                `-1` uses all available cores. Default is `1`.
 
         Yields:
             `Doc` objects, in order.
@@ -323,16 +449,15 @@ class _PhraseMatcher:
             >>> [entry[1] for entry in output]
             [[('DRAGON', 3, 4, 100)], [('DRAGON', 3, 4, 100)]]
         """
-        if as_tuples:
-            for doc, context in stream:
-                matches = self(doc)
+        for (doc, matches), context in pipe_matches(
+            self, stream, batch_size, n_process, as_tuples
+        ):
+            if as_tuples:
                 if return_matches:
                     yield ((doc, matches), context)
                 else:
                     yield (doc, context)
-        else:
-            for doc in stream:
-                matches = self(doc)
+            else:
                 if return_matches:
                     yield (doc, matches)
                 else:
@@ -1,11 +1,17 @@
 """Module for FuzzyMatcher with an API semi-analogous to spaCy's PhraseMatcher."""
 from __future__ import annotations
 
-from typing import Any
+from collections import Counter, defaultdict
+from math import ceil
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
 
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
 from . import _PhraseMatcher
+from ._phrasematcher import PatternRecord
+from ..process import deletes, doc_cache, qgrams
 from ..search.fuzzysearcher import FuzzySearcher
 
 
@@ -18,20 +24,53 @@ class FuzzyMatcher(_PhraseMatcher):
     Attributes:
         defaults: Keyword arguments to be used as default matching settings.
             See `FuzzySearcher` documentation for details.
+        max_edit_distance: Maximum Levenshtein distance between a single-token
+            pattern and a doc token for the two to be fuzzy compared.
+            `0` compares every token.
+        exact_fast_path: Whether exact pattern occurrences are found
+            with spaCy's `PhraseMatcher` before fuzzy matching.
         name: Class attribute - the name of the matcher.
+        min_qgram_overlap: Fraction of a pattern's distinct character q-grams
+            a doc window must share with it to be fuzzy compared.
+            `0` compares every window.
+        qgram_size: Character length of the q-grams indexed.
         type: The kind of matcher object.
         _callbacks:
             On match functions to modify `Doc` objects passed to the matcher.
             Can make use of the matches identified.
+        _exact_keys:
+            Maps `PhraseMatcher` match ids to the (label, index) key
+            of each pattern.
+        _deletes_index:
+            SymSpell index from deletion variants of single-token patterns
+            to the (label, index) keys of patterns with that variant.
+        _deletes_keys:
+            (label, index) keys of the patterns in the deletion index.
+        _exact_matchers:
+            `PhraseMatcher` objects matching the patterns on the "LOWER"
+            attribute (when ignoring case) and the "ORTH" attribute.
         _patterns:
             Patterns added to the matcher. Contains patterns
             and kwargs that should be passed to matching function
             for each labels added.
+        _qgram_index:
+            Inverted index from (pattern token length, q-gram)
+            to the (label, index) keys of patterns containing that q-gram.
+        _qgram_counts:
+            Number of distinct q-grams in each indexed pattern.
     """
 
     name = "fuzzy_matcher"
 
-    def __init__(self, vocab: Vocab, **defaults: Any) -> None:
+    def __init__(
+        self,
+        vocab: Vocab,
+        min_qgram_overlap: float = 0.0,
+        qgram_size: int = 3,
+        exact_fast_path: bool = False,
+        max_edit_distance: int = 0,
+        **defaults: Any,
+    ) -> None:
         """Initializes the fuzzy matcher with the given defaults.
 
         Args:
@@ -41,6 +80,28 @@ class FuzzyMatcher(_PhraseMatcher):
                 spaczz matchers are currently pure
                 Python and do not share vocabulary
                 with spacy pipelines.
+            min_qgram_overlap: Fraction (0-1) of a pattern's distinct
+                lower-cased character q-grams a doc window must share
+                with the pattern before the two are fuzzy compared.
+                Higher values skip more comparisons at the cost of recall.
+                Default is `0.0`, which compares every window.
+            qgram_size: Character length of the q-grams indexed.
+                Patterns shorter than this are always compared.
+                Default is `3`.
+            exact_fast_path: Whether to find exact occurrences of patterns
+                matched with the "simple" or "partial" fuzzy_func
+                in one pass of spaCy's `PhraseMatcher` first.
+                These are returned with a ratio of 100 and windows overlapping
+                them are not fuzzy compared. Patterns with a min_r2 of 100
+                are not fuzzy matched at all, so only exact occurrences
+                with the same tokenization as the pattern are found for them.
+                Default is `False`.
+            max_edit_distance: Maximum Levenshtein distance between
+                the lower-cased text of a single-token pattern and a doc token
+                before the two are fuzzy compared. Candidates are found
+                with a deletion (SymSpell) index built as patterns are added,
+                then verified with the pattern's fuzzy_func.
+                Default is `0`, which compares every token.
             **defaults: Keyword arguments that will
                 be used as default matching settings.
                 These arguments will become the new defaults for matching.
@@ -49,3 +110,289 @@ class FuzzyMatcher(_PhraseMatcher):
         super().__init__(vocab=vocab, **defaults)
         self.type = "fuzzy"
         self._searcher = FuzzySearcher(vocab=vocab)
+        self.min_qgram_overlap = min_qgram_overlap
+        self.qgram_size = qgram_size
+        self._qgram_index: DefaultDict[
+            Tuple[int, str], Set[Tuple[str, int]]
+        ] = defaultdict(set)
+        self._qgram_counts: Dict[Tuple[str, int], int] = {}
+        self.exact_fast_path = exact_fast_path
+        self._exact_matchers = {
+            True: PhraseMatcher(vocab, attr="LOWER"),
+            False: PhraseMatcher(vocab, attr="ORTH"),
+        }
+        self._exact_keys: Dict[int, Tuple[str, int]] = {}
+        self.max_edit_distance = max_edit_distance
+        self._deletes_index: DefaultDict[str, Set[Tuple[str, int]]] = defaultdict(set)
+        self._deletes_keys: Set[Tuple[str, int]] = set()
+
+    def add(
+        self,
+        label: str,
+        patterns: List[Doc],
+        kwargs: Optional[List[Dict[str, Any]]] = None,
+        on_match: Optional[
+            Callable[[_PhraseMatcher, Doc, int, List[Tuple[str, int, int, int]]], None]
+        ] = None,
+    ) -> None:
+        """Add a rule to the matcher and index its patterns' q-grams.
+
+        See `_PhraseMatcher.add` for argument details.
+
+        Args:
+            label: Name of the rule added to the matcher.
+            patterns: `Doc` objects that will be matched
+                against the `Doc` object the matcher is called on.
+            kwargs: Optional arguments to modify the behavior of the matching.
+                Default is `None`.
+            on_match: Optional callback function to modify the
+                `Doc` object the matcher is called on after matching.
+                Default is `None`.
+        """
+        start = len(self._records[label]) if label in self else 0
+        super().add(label, patterns, kwargs, on_match)
+        for record in self._records[label][start:]:
+            if record.qgrams:
+                self._qgram_counts[record.key] = len(record.qgrams)
+                for gram in record.qgrams:
+                    self._qgram_index[(record.n_tokens, gram)].add(record.key)
+            if self.max_edit_distance > 0 and record.n_tokens == 1:
+                self._deletes_keys.add(record.key)
+                for variant in deletes(record.text.lower(), self.max_edit_distance):
+                    self._deletes_index[variant].add(record.key)
+            if self.exact_fast_path and record.n_tokens:
+                key = repr(record.key)
+                self._exact_keys[self.vocab.strings.add(key)] = record.key
+                for exact_matcher in self._exact_matchers.values():
+                    exact_matcher.add(key, [record.pattern])
+
+    def remove(self, label: str) -> None:
+        """Remove a label and its respective patterns from the matcher and index.
+
+        Args:
+            label: Name of the rule added to the matcher.
+        """
+        records = self._records[label] if label in self else []
+        super().remove(label)
+        for record in records:
+            for gram in record.qgrams:
+                postings = self._qgram_index[(record.n_tokens, gram)]
+                postings.discard(record.key)
+                if not postings:
+                    del self._qgram_index[(record.n_tokens, gram)]
+            self._qgram_counts.pop(record.key, None)
+            if record.key in self._deletes_keys:
+                self._deletes_keys.discard(record.key)
+                for variant in deletes(record.text.lower(), self.max_edit_distance):
+                    postings = self._deletes_index[variant]
+                    postings.discard(record.key)
+                    if not postings:
+                        del self._deletes_index[variant]
+            key = repr(record.key)
+            if self._exact_keys.pop(self.vocab.strings[key], None):
+                for exact_matcher in self._exact_matchers.values():
+                    exact_matcher.remove(key)
+
+    def _compile_pattern(
+        self, key: Tuple[str, int], pattern: Doc, kwargs: Dict[str, Any]
+    ) -> PatternRecord:
+        """Compiles a pattern into a `PatternRecord` with its q-gram signature.
+
+        Args:
+            key: (label, index) pair identifying the pattern.
+            pattern: The pattern `Doc` object.
+            kwargs: The match settings added with the pattern.
+
+        Returns:
+            The pattern's `PatternRecord`.
+        """
+        record = super()._compile_pattern(key, pattern, kwargs)
+        return record._replace(
+            qgrams=frozenset(qgrams(pattern.text.lower(), self.qgram_size))
+        )
+
+    def _candidates(
+        self, doc: Doc, records: List[PatternRecord]
+    ) -> Optional[List[Optional[Set[int]]]]:
+        """Pre-filters doc windows with the q-gram and deletion indexes.
+
+        When both indexes cover a pattern, a window must pass both.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+
+        Returns:
+            `None` if filtering is disabled, otherwise one set of
+            candidate window start indices (or `None` for all windows)
+            per record.
+        """
+        qgram_candidates = self._qgram_candidates(doc, records)
+        deletes_candidates = self._deletes_candidates(doc, records)
+        if qgram_candidates is None:
+            return deletes_candidates
+        if deletes_candidates is None:
+            return qgram_candidates
+        return [
+            b if a is None else a if b is None else a & b
+            for a, b in zip(qgram_candidates, deletes_candidates)
+        ]
+
+    def _qgram_candidates(
+        self, doc: Doc, records: List[PatternRecord]
+    ) -> Optional[List[Optional[Set[int]]]]:
+        """Count filters doc windows against the q-gram index.
+
+        A window is a candidate for a pattern with the same number of tokens
+        if they share at least `min_qgram_overlap` of the pattern's q-grams.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+
+        Returns:
+            `None` if filtering is disabled, otherwise one set of
+            candidate window start indices (or `None` for all windows)
+            per record.
+        """
+        if self.min_qgram_overlap <= 0:
+            return None
+        cache = doc_cache(doc)
+        starts, ends = cache.starts, cache.ends
+        lengths = {record.n_tokens for record in records}
+        candidates: Dict[Tuple[str, int], Set[int]] = defaultdict(set)
+        for n in lengths:
+            for start in range(len(doc) - n + 1):
+                window = cache.text[starts[start] : ends[start + n - 1]].lower()
+                counts: Counter[Tuple[str, int]] = Counter()
+                for gram in qgrams(window, self.qgram_size):
+                    counts.update(self._qgram_index.get((n, gram), ()))
+                for key, count in counts.items():
+                    if count >= ceil(self.min_qgram_overlap * self._qgram_counts[key]):
+                        candidates[key].add(start)
+        return [
+            candidates.get(record.key, set())
+            if record.key in self._qgram_counts
+            else None
+            for record in records
+        ]
+
+    def _deletes_candidates(
+        self, doc: Doc, records: List[PatternRecord]
+    ) -> Optional[List[Optional[Set[int]]]]:
+        """Looks up the doc tokens near single-token patterns in the deletion index.
+
+        A token is a candidate for a single-token pattern if they share
+        a deletion variant, which every pair within `max_edit_distance`
+        Levenshtein edits does. Each distinct token text is looked up once.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+
+        Returns:
+            `None` if the index is disabled or empty, otherwise one set of
+            candidate token indices (or `None` for all windows) per record.
+        """
+        if self.max_edit_distance <= 0 or not self._deletes_keys:
+            return None
+        tokens: DefaultDict[str, List[int]] = defaultdict(list)
+        for i, text in enumerate(doc_cache(doc).token_texts):
+            tokens[text.lower()].append(i)
+        candidates: DefaultDict[Tuple[str, int], Set[int]] = defaultdict(set)
+        for text, indices in tokens.items():
+            found: Set[Tuple[str, int]] = set()
+            for variant in deletes(text, self.max_edit_distance):
+                found.update(self._deletes_index.get(variant, ()))
+            for key in found:
+                candidates[key].update(indices)
+        return [
+            candidates.get(record.key, set())
+            if record.key in self._deletes_keys
+            else None
+            for record in records
+        ]
+
+    def _match_patterns(
+        self,
+        doc: Doc,
+        records: List[PatternRecord],
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+    ) -> List[List[Tuple[int, int, int]]]:
+        """Finds exact occurrences natively before fuzzy searching the rest.
+
+        With `exact_fast_path` on, occurrences of "simple" and "partial"
+        patterns whose text equals the pattern text are ratio 100 matches.
+        Windows overlapping them are dropped from the fuzzy search,
+        and patterns with a min_r2 of 100 skip it entirely.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            records: The compiled patterns.
+            candidates: Window start indices to search for each pattern.
+                Default is `None`, which uses `_candidates()`.
+
+        Returns:
+            The (start, end, ratio) matches of each pattern.
+        """
+        if candidates is None:
+            candidates = self._candidates(doc, records)
+        exact: Dict[int, List[Tuple[int, int, int]]] = {
+            i: []
+            for i, record in enumerate(records)
+            if self.exact_fast_path
+            and record.n_tokens
+            and record.kwargs.get("fuzzy_func", "simple") in ("simple", "partial")
+        }
+        if not exact:
+            return super()._match_patterns(doc, records, candidates)
+        positions = {record.key: i for i, record in enumerate(records)}
+        ignore_cases = {i: records[i].kwargs.get("ignore_case", True) for i in exact}
+        for ignore_case in set(ignore_cases.values()):
+            for match_id, start, end in self._exact_matchers[ignore_case](doc):
+                i = positions[self._exact_keys[match_id]]
+                if ignore_cases.get(i) != ignore_case:
+                    continue
+                span_text = doc[start:end].text
+                if ignore_case:
+                    span_text = span_text.lower()
+                if span_text == records[i].text:
+                    exact[i].append((start, end, 100))
+        fuzzy_indices = []
+        fuzzy_candidates: List[Optional[Set[int]]] = []
+        for i, record in enumerate(records):
+            window_starts = candidates[i] if candidates else None
+            if i in exact:
+                exact[i] = self._searcher._filter_overlapping_matches(sorted(exact[i]))
+                if record.settings.min_r2 >= 100:
+                    continue
+                if exact[i]:
+                    if window_starts is None:
+                        window_starts = set(range(len(doc) - record.n_tokens + 1))
+                    window_starts = window_starts.difference(
+                        *(
+                            range(start - record.n_tokens + 1, end)
+                            for start, end, _ in exact[i]
+                        )
+                    )
+            fuzzy_indices.append(i)
+            fuzzy_candidates.append(window_starts)
+        fuzzy_matches = {}
+        if fuzzy_indices:
+            fuzzy_matches = dict(
+                zip(
+                    fuzzy_indices,
+                    super()._match_patterns(
+                        doc, [records[i] for i in fuzzy_indices], fuzzy_candidates
+                    ),
+                )
+            )
+        all_matches = []
+        for i, record in enumerate(records):
+            matches = fuzzy_matches.get(i, [])
+            if exact.get(i):
+                matches = self._searcher._filter_overlapping_matches(
+                    sorted(exact[i] + matches, key=lambda x: (-x[2], x[0]))
+                )[: record.settings.top_k]
+            all_matches.append(matches)
+        return all_matches
@@ -1,8 +1,9 @@
 """Module for SimilarityMatcher with an API semi-analogous to spaCy's PhraseMatcher."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from spacy.tokens import Doc
 from spacy.vocab import Vocab
 
 from . import _PhraseMatcher
@@ -52,4 +53,40 @@ class SimilarityMatcher(_PhraseMatcher):
         """
         super().__init__(vocab=vocab, **defaults)
         self.type = "similarity"
-        self._searcher = SimilaritySearcher(vocab=vocab)
+        self._searcher: SimilaritySearcher = SimilaritySearcher(vocab=vocab)
+
+    def add(
+        self,
+        label: str,
+        patterns: List[Doc],
+        kwargs: Optional[List[Dict[str, Any]]] = None,
+        on_match: Optional[
+            Callable[[_PhraseMatcher, Doc, int, List[Tuple[str, int, int, int]]], None]
+        ] = None,
+    ) -> None:
+        """Add a rule to the matcher and precompute its patterns' vectors.
+
+        See `_PhraseMatcher.add` for argument details.
+
+        Args:
+            label: Name of the rule added to the matcher.
+            patterns: `Doc` objects that will be matched
+                against the `Doc` object the matcher is called on.
+            kwargs: Optional arguments to modify the behavior of the matching.
+                Default is `None`.
+            on_match: Optional callback function to modify the
+                `Doc` object the matcher is called on after matching.
+                Default is `None`.
+        """
+        super().add(label, patterns, kwargs, on_match)
+        self._searcher.add_queries(patterns)
+
+    def remove(self, label: str) -> None:
+        """Remove a label and its respective patterns and pattern vectors.
+
+        Args:
+            label: Name of the rule added to the matcher.
+        """
+        patterns = self._patterns[label]["patterns"] if label in self else []
+        super().remove(label)
+        self._searcher.remove_queries(patterns)
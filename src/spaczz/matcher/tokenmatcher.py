@@ -1,8 +1,9 @@
 """Module for TokenMatcher with an API semi-analogous to spaCy's Matcher."""
 from __future__ import annotations
 
-from collections import defaultdict
-from copy import deepcopy
+from collections import Counter, defaultdict
+from functools import partial
+from time import perf_counter
 from typing import (
     Any,
     Callable,
@@ -12,15 +13,44 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Set,
     Tuple,
     Union,
 )
+from uuid import uuid4
+from weakref import finalize, WeakKeyDictionary
 
+import numpy as np
+import regex
+from spacy.attrs import LOWER, ORTH
 from spacy.matcher import Matcher
-from spacy.tokens import Doc
+from spacy.tokens import Doc, Token
 from spacy.vocab import Vocab
 
+from ..process import BKTree, doc_cache, LRUCache, max_indel_distance
 from ..search import TokenSearcher
+from ..search.tokensearcher import TokenPredicate
+from ..util import pipe_matches
+
+# Prefix of the token extension each TokenMatcher's compiled spaCy Matcher
+# checks FUZZY and FREGEX tokens on.
+SPEC_IDS_ATTR = "spaczz_spec_ids"
+
+# Space delimited ids of the token specs each doc token satisfies,
+# by the extension name of the TokenMatcher currently matching the doc.
+_doc_spec_ids: "WeakKeyDictionary[Doc, Dict[str, List[str]]]" = WeakKeyDictionary()
+
+
+def _get_spec_ids(attr: str, token: Token) -> str:
+    """Getter for the `Token` attribute FUZZY and FREGEX tokens are matched on."""
+    spec_ids = _doc_spec_ids.get(token.doc, {}).get(attr)
+    return spec_ids[token.i] if spec_ids else ""
+
+
+def _remove_spec_ids_extension(attr: str) -> None:
+    """Unregisters a collected TokenMatcher's token extension."""
+    if Token.has_extension(attr):
+        Token.remove_extension(attr)
 
 
 class TokenMatcher:
@@ -45,16 +75,58 @@ class TokenMatcher:
             See `TokenSearcher.match()` documentation for details.
         name: Class attribute - the name of the matcher.
         type: The kind of matcher object.
+        _anchor_offsets:
+            Offsets of FUZZY and FREGEX tokens from their pattern's anchor,
+            by the attribute id and string hash the anchor requires.
+            `None` until built for the current patterns.
+        _anchors:
+            The anchor of each pattern with FUZZY or FREGEX tokens,
+            see `_pattern_anchor()`, by label.
         _callbacks:
             On match functions to modify `Doc` objects passed to the matcher.
             Can make use of the matches identified.
+        _spec_cache:
+            `LRUCache` from doc token texts to the spec ids they satisfy,
+            kept across docs until patterns are added or removed.
+        _matcher:
+            spaCy `Matcher` the patterns are compiled into as they are added.
+            FUZZY and FREGEX tokens become predicates on the ids of the
+            token specs each doc token satisfies, which are found per doc.
         _patterns:
             Patterns added to the matcher.
+        _regex_compile_time:
+            Total seconds spent compiling FREGEX patterns.
+        _regexes:
+            Each distinct FREGEX pattern string compiled once.
+            Kept out of `patterns`, which returns the original strings.
+        _spec_counts:
+            Number of pattern tokens using each token spec.
+        _spec_attr:
+            Name of the matcher's own token extension holding the spec ids
+            of the doc being matched, so matchers running on the same doc
+            do not see each other's ids.
+        _spec_funcs:
+            Function testing token texts against each token spec.
+        _spec_ids:
+            Id of each FUZZY and FREGEX token spec (its `TokenPredicate`),
+            unique within the matcher.
+        _next_spec_id:
+            Id the next new token spec gets.
+        _unanchored:
+            Number of patterns with FUZZY or FREGEX tokens but no anchor.
+            Every doc token is compared with the token specs while nonzero.
+        _term_trees:
+            `BKTree` of the "simple" FUZZY pattern token texts
+            (lower-cased for "LOWER" tokens), keyed by whether case is ignored,
+            along with the texts each tree entry came from and the lowest MIN_R
+            among them. `None` until built for the current patterns.
     """
 
     name = "token_matcher"
 
-    def __init__(self, vocab: Vocab, **defaults: Any) -> None:
+    def __init__(
+        self, vocab: Vocab, cache_size: Optional[int] = 10000, **defaults: Any
+    ) -> None:
         """Initializes the base phrase matcher with the given defaults.
 
         Args:
@@ -64,6 +136,11 @@ class TokenMatcher:
                 spaczz matchers are currently pure
                 Python and do not share vocabulary
                 with spaCy pipelines.
+            cache_size: Maximum number of distinct token texts whose
+                FUZZY and FREGEX results are cached across docs.
+                The least recently used texts are evicted first.
+                `None` caches every text and `0` disables the cache.
+                Default is `10000`.
             **defaults: Keyword arguments that will
                 be used as default matching settings.
                 These arguments will become the new defaults for matching.
@@ -82,6 +159,24 @@ class TokenMatcher:
         ] = {}
         self._patterns: DefaultDict[str, List[List[Dict[str, Any]]]] = defaultdict(list)
         self._searcher = TokenSearcher(vocab=vocab)
+        self._matcher = Matcher(vocab)
+        self._spec_ids: Dict[TokenPredicate, int] = {}
+        self._next_spec_id = 0
+        self._spec_attr = f"{SPEC_IDS_ATTR}_{uuid4().hex}"
+        finalize(self, _remove_spec_ids_extension, self._spec_attr)
+        self._spec_counts: Counter[TokenPredicate] = Counter()
+        self._spec_funcs: Dict[TokenPredicate, Callable[[str], bool]] = {}
+        self._spec_cache: LRUCache[str, str] = LRUCache(cache_size)
+        self._regexes: Dict[str, regex.Pattern] = {}
+        self._regex_compile_time = 0.0
+        self._term_trees: Optional[
+            Dict[bool, Tuple[BKTree, Dict[str, Set[str]], int]]
+        ] = None
+        self._anchors: DefaultDict[
+            str, List[Optional[Tuple[int, int, Tuple[int, ...]]]]
+        ] = defaultdict(list)
+        self._unanchored = 0
+        self._anchor_offsets: Optional[Dict[int, Dict[int, Set[int]]]] = None
 
     def __call__(self, doc: Doc) -> List[Tuple[str, int, int, None]]:
         """Find all sequences matching the supplied patterns in the doc.
@@ -106,18 +201,20 @@ class TokenMatcher:
             >>> matcher(doc)
             [('NAME', 0, 2, None)]
         """
-        mapped_patterns = defaultdict(list)
-        matcher = Matcher(self.vocab)
-        for label, patterns in self._patterns.items():
-            for pattern in patterns:
-                mapped_patterns[label].extend(
-                    _spacyfy(
-                        self._searcher.match(doc, pattern, **self.defaults), pattern,
-                    )
-                )
-        for label in mapped_patterns.keys():
-            matcher.add(label, mapped_patterns[label])
-        matches = matcher(doc)
+        if not Token.has_extension(self._spec_attr):
+            Token.set_extension(
+                self._spec_attr, getter=partial(_get_spec_ids, self._spec_attr)
+            )
+        spec_ids = _doc_spec_ids.setdefault(doc, {})
+        previous = spec_ids.get(self._spec_attr)
+        spec_ids[self._spec_attr] = self._match_specs(doc)
+        try:
+            matches = self._matcher(doc)
+        finally:
+            if previous is None:
+                del spec_ids[self._spec_attr]
+            else:
+                spec_ids[self._spec_attr] = previous
         if matches:
             return [
                 (self.vocab.strings[match_id], start, end, None)
@@ -134,6 +231,40 @@ class TokenMatcher:
         """The number of labels added to the matcher."""
         return len(self._patterns)
 
+    @property
+    def cache_stats(self) -> Dict[str, float]:
+        """Token text cache hits, misses, evictions and hit rate.
+
+        Returns:
+            Running totals since the matcher was created,
+            along with the fraction of lookups that were hits.
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.matcher import TokenMatcher
+            >>> nlp = spacy.blank("en")
+            >>> matcher = TokenMatcher(nlp.vocab)
+            >>> matcher.add("AUTHOR", [[{"TEXT": {"FUZZY": "Kerouac"}}]])
+            >>> matches = matcher(nlp("Kerouac Kerouac"))
+            >>> matches = matcher(nlp("Kerouac"))
+            >>> matcher.cache_stats
+            {'hits': 1, 'misses': 1, 'evictions': 0, 'hit_rate': 0.5}
+        """
+        return {**self._spec_cache.stats, "hit_rate": self._spec_cache.hit_rate}
+
+    @property
+    def regex_stats(self) -> Dict[str, float]:
+        """Number of distinct compiled FREGEX patterns and their compile time.
+
+        Returns:
+            The number of "patterns" currently compiled and the
+            total "compile_time" in seconds spent compiling patterns.
+        """
+        return {
+            "patterns": len(self._regexes),
+            "compile_time": self._regex_compile_time,
+        }
+
     @property
     def labels(self) -> Tuple[str, ...]:
         """All labels present in the matcher.
@@ -207,6 +338,9 @@ class TokenMatcher:
             {"TEXT": {"FREGEX": "(database){e<=1}"}},
             {"LOWER": {"FUZZY": "access", "MIN_R": 85, "FUZZY_FUNC": "quick_lev"}}
 
+        All patterns are compiled and validated before any is added,
+        so if one is invalid the matcher is left unchanged.
+
         Args:
             label: Name of the rule added to the matcher.
             patterns: List of dictionary lists that will be matched
@@ -218,6 +352,7 @@ class TokenMatcher:
         Raises:
             TypeError: If patterns is not an iterable of `Doc` objects.
             ValueError: pattern cannot have zero tokens.
+            ValueError: If spaCy's `Matcher` rejects a pattern.
 
         Example:
             >>> import spacy
@@ -228,14 +363,57 @@ class TokenMatcher:
             >>> "AUTHOR" in matcher
             True
         """
+        all_specs = []
         for pattern in patterns:
             if len(pattern) == 0:
                 raise ValueError("pattern cannot have zero tokens.")
             if isinstance(pattern, list):
-                self._patterns[label].append(list(pattern))
+                all_specs.append(self._compile_predicates(pattern))
             else:
                 raise TypeError("Patterns must be lists of dictionaries.")
+        new_specs = {
+            spec: None
+            for specs in all_specs
+            for spec in specs
+            if spec is not None and spec not in self._spec_ids
+        }
+        regexes = {
+            spec.text: self._compile_regex(spec.text)
+            for spec in new_specs
+            if spec.kind == "FREGEX" and spec.text not in self._regexes
+        }
+        spec_ids = {
+            **self._spec_ids,
+            **{spec: self._next_spec_id + i for i, spec in enumerate(new_specs)},
+        }
+        compiled_patterns = [
+            self._compile_pattern(pattern, specs, spec_ids)
+            for pattern, specs in zip(patterns, all_specs)
+        ]
+        if compiled_patterns:
+            # spaCy keeps the patterns added before an invalid one,
+            # so they are validated on a scratch Matcher first.
+            Matcher(self.vocab).add(label, compiled_patterns)
+            self._matcher.add(label, compiled_patterns)
+        self._regexes.update(regexes)
+        for spec in new_specs:
+            self._spec_funcs[spec] = self._searcher.predicate_func(
+                spec, self._regexes.get(spec.text)
+            )
+        self._spec_ids = spec_ids
+        self._next_spec_id += len(new_specs)
+        for pattern, specs in zip(patterns, all_specs):
+            self._patterns[label].append(list(pattern))
+            self._spec_counts.update(spec for spec in specs if spec is not None)
+            if any(specs):
+                anchor = self._pattern_anchor(pattern, specs)
+                self._anchors[label].append(anchor)
+                if anchor is None:
+                    self._unanchored += 1
         self._callbacks[label] = on_match
+        self._spec_cache.clear()
+        self._term_trees = None
+        self._anchor_offsets = None
 
     def remove(self, label: str) -> None:
         """Remove a label and its respective patterns from the matcher.
@@ -257,12 +435,274 @@ class TokenMatcher:
             False
         """
         try:
-            del self._patterns[label]
+            patterns = self._patterns.pop(label)
             del self._callbacks[label]
         except KeyError:
             raise ValueError(
                 f"The label: {label} does not exist within the matcher rules."
             )
+        if patterns:
+            self._matcher.remove(label)
+        self._unanchored -= self._anchors.pop(label, []).count(None)
+        for pattern in patterns:
+            for spec in self._compile_predicates(pattern):
+                if spec is not None:
+                    self._spec_counts[spec] -= 1
+                    if not self._spec_counts[spec]:
+                        del self._spec_counts[spec]
+                        del self._spec_ids[spec]
+                        del self._spec_funcs[spec]
+        used = {spec.text for spec in self._spec_ids if spec.kind == "FREGEX"}
+        for text in set(self._regexes) - used:
+            del self._regexes[text]
+        self._spec_cache.clear()
+        self._term_trees = None
+        self._anchor_offsets = None
+
+    def _compile_predicates(
+        self, pattern: List[Dict[str, Any]]
+    ) -> List[Optional[TokenPredicate]]:
+        """Returns the spec of each FUZZY or FREGEX pattern token, else `None`.
+
+        Defaults are resolved here, so tokens matched the same way
+        share a spec however they were written.
+
+        Args:
+            pattern: Extended spaCy token pattern.
+
+        Returns:
+            A `TokenPredicate` or `None` for each token.
+        """
+        return self._searcher.compile_pattern(
+            pattern,
+            self.defaults.get("min_r", 75),
+            self.defaults.get("fuzzy_func", "simple"),
+        )
+
+    def _compile_pattern(
+        self,
+        pattern: List[Dict[str, Any]],
+        specs: List[Optional[TokenPredicate]],
+        spec_ids: Dict[TokenPredicate, int],
+    ) -> List[Dict[str, Any]]:
+        """Turns a pattern into a spaCy `Matcher` pattern.
+
+        The FUZZY or FREGEX attribute of each token is replaced by
+        a regex predicate matching the id of its spec on the matcher's
+        `_spec_attr` extension. Other attributes are left for the `Matcher` to check.
+
+        Args:
+            pattern: Extended spaCy token pattern.
+            specs: The spec of each token, from `_compile_predicates()`.
+            spec_ids: Id of each spec, including ones not registered yet.
+
+        Returns:
+            The spaCy `Matcher` pattern.
+        """
+        compiled = []
+        for token, spec in zip(pattern, specs):
+            if spec is None:
+                compiled.append(token)
+                continue
+            compiled_token = {
+                key: value for key, value in token.items() if key != spec.case
+            }
+            compiled_token["_"] = {
+                **token.get("_", {}),
+                self._spec_attr: {"REGEX": f" {spec_ids[spec]} "},
+            }
+            compiled.append(compiled_token)
+        return compiled
+
+    def _pattern_anchor(
+        self, pattern: List[Dict[str, Any]], specs: List[Optional[TokenPredicate]]
+    ) -> Optional[Tuple[int, int, Tuple[int, ...]]]:
+        """Picks the exact token a pattern's FUZZY and FREGEX tokens are found by.
+
+        The anchor is the pattern token with the longest plain string
+        "TEXT", "ORTH" or "LOWER" value, preferring case-sensitive values.
+        Patterns using "OP" do not fix the offset between tokens,
+        or may even negate them, so they are not anchored.
+
+        Args:
+            pattern: Extended spaCy token pattern.
+            specs: The spec of each token, from `_compile_predicates()`.
+
+        Returns:
+            The attribute id and string hash the anchor token requires,
+            with the offsets of the FUZZY and FREGEX tokens from it,
+            or `None` if no token can anchor the pattern.
+        """
+        if any("OP" in token for token in pattern):
+            return None
+        best: Optional[Tuple[int, bool, int, int, str]] = None
+        for i, token in enumerate(pattern):
+            for key, attr in (("TEXT", ORTH), ("ORTH", ORTH), ("LOWER", LOWER)):
+                value = token.get(key)
+                if not isinstance(value, str) or not value:
+                    continue
+                candidate = (len(value), attr == ORTH, -i, attr, value)
+                if best is None or candidate[:3] > best[:3]:
+                    best = candidate
+        if best is None:
+            return None
+        _, _, start, attr, value = best
+        offsets = tuple(i + start for i, spec in enumerate(specs) if spec is not None)
+        return attr, self.vocab.strings.add(value), offsets
+
+    def _anchor_positions(self, doc: Doc) -> Optional[Set[int]]:
+        """Finds the doc tokens that pattern FUZZY and FREGEX tokens may match.
+
+        These are the tokens at each pattern's FUZZY and FREGEX token offsets
+        from the doc tokens its anchor matches. A token matched by a pattern
+        is always among them.
+
+        Args:
+            doc: The `Doc` object being matched over.
+
+        Returns:
+            The indices of the tokens, or `None` if some pattern is not anchored.
+        """
+        if self._unanchored:
+            return None
+        if self._anchor_offsets is None:
+            self._anchor_offsets = {}
+            for anchors in self._anchors.values():
+                for anchor in anchors:
+                    if anchor is not None:
+                        attr, value, offsets = anchor
+                        value_offsets = self._anchor_offsets.setdefault(attr, {})
+                        value_offsets.setdefault(value, set()).update(offsets)
+        positions: Set[int] = set()
+        for attr, value_offsets in self._anchor_offsets.items():
+            values = doc.to_array(attr)
+            anchored = np.isin(values, np.array(list(value_offsets), dtype=np.uint64))
+            for i in np.flatnonzero(anchored).tolist():
+                anchor_offsets = value_offsets[int(values[i])]
+                positions.update(i + offset for offset in anchor_offsets)
+        return {i for i in positions if 0 <= i < len(doc)}
+
+    def _compile_regex(self, pattern: str) -> regex.Pattern:
+        """Compiles a FREGEX pattern, adding to the total compile time."""
+        start = perf_counter()
+        compiled = regex.compile(pattern)
+        self._regex_compile_time += perf_counter() - start
+        return compiled
+
+    def _match_specs(self, doc: Doc) -> List[str]:
+        """Finds the ids of the token specs each doc token satisfies.
+
+        Each distinct token text is looked up in the cache
+        and otherwise compared once per spec.
+        Only the texts of tokens `_anchor_positions()` finds are compared,
+        other tokens are not matched by any pattern's FUZZY or FREGEX tokens.
+        Indexed FUZZY specs only compare the texts `_term_candidates()` finds.
+
+        Args:
+            doc: The `Doc` object being matched over.
+
+        Returns:
+            The space delimited spec ids of each doc token.
+        """
+        token_texts = doc_cache(doc).token_texts
+        positions = self._anchor_positions(doc)
+        if positions is not None:
+            needed = {token_texts[i] for i in positions}
+        else:
+            needed = set(token_texts)
+        spec_ids: Dict[str, str] = {}
+        texts = set()
+        for text in needed:
+            cached = self._spec_cache.get(text)
+            if cached is None:
+                texts.add(text)
+            else:
+                spec_ids[text] = cached
+        if not texts:
+            return [spec_ids.get(text, "") for text in token_texts]
+        term_candidates = self._term_candidates(doc, texts) if self._spec_ids else None
+        matched: DefaultDict[str, List[str]] = defaultdict(list)
+        for spec, spec_id in self._spec_ids.items():
+            candidates = None
+            if term_candidates and spec.kind == "FUZZY" and spec.fuzzy_func == "simple":
+                candidates = term_candidates.get((spec.ignore_case, spec.text))
+            func = self._spec_funcs[spec]
+            for text in texts if candidates is None else candidates:
+                if func(text):
+                    matched[text].append(str(spec_id))
+        for text in texts:
+            ids = matched.get(text)
+            spec_ids[text] = f" {' '.join(ids)} " if ids else ""
+            self._spec_cache.put(text, spec_ids[text])
+        return [spec_ids.get(text, "") for text in token_texts]
+
+    def _build_term_trees(
+        self,
+    ) -> Dict[bool, Tuple[BKTree, Dict[str, Set[str]], int]]:
+        """Indexes the texts of FUZZY pattern tokens matched with "simple".
+
+        Other fuzzy matching functions are not bounded by the
+        Levenshtein distance so their pattern tokens are not indexed.
+
+        Returns:
+            A (tree, source texts, lowest MIN_R) tuple for each case setting.
+        """
+        terms: DefaultDict[bool, DefaultDict[str, Set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        min_rs: Dict[bool, int] = {}
+        for spec in self._spec_ids:
+            if spec.kind != "FUZZY" or spec.fuzzy_func != "simple":
+                continue
+            case_bool, text, min_r = spec.ignore_case, spec.text, spec.min_r or 0
+            terms[case_bool][text.lower() if case_bool else text].add(text)
+            min_rs[case_bool] = min(min_rs.get(case_bool, min_r), min_r)
+        return {
+            case_bool: (BKTree(texts), dict(texts), min_rs[case_bool])
+            for case_bool, texts in terms.items()
+        }
+
+    def _term_candidates(
+        self, doc: Doc, texts: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[Tuple[bool, str], Set[str]]]:
+        """Finds the doc token texts each indexed FUZZY pattern token may match.
+
+        Each distinct token text runs one BK-tree search per case setting,
+        with the radius `max_indel_distance()` gives for its length
+        and the lowest MIN_R in the tree. Pattern tokens reaching
+        their MIN_R with a token text are always among its results.
+
+        Args:
+            doc: The `Doc` object being matched over.
+            texts: The token texts to search for.
+                Default is `None`, which searches for every doc token text.
+
+        Returns:
+            A mapping from (ignore_case, FUZZY text) pairs of indexed pattern
+            tokens to doc token texts, or `None` if nothing is indexed.
+        """
+        if self._term_trees is None:
+            self._term_trees = self._build_term_trees()
+        if not self._term_trees:
+            return None
+        candidates: Dict[Tuple[bool, str], Set[str]] = {}
+        if texts is None:
+            texts = set(doc_cache(doc).token_texts)
+        for case_bool, (tree, sources, min_r) in self._term_trees.items():
+            for source_texts in sources.values():
+                for source in source_texts:
+                    candidates[(case_bool, source)] = set()
+            for text in texts:
+                query = text.lower() if case_bool else text
+                radius = max_indel_distance(len(query), min_r)
+                if radius is None:
+                    terms: Iterable[str] = sources
+                else:
+                    terms = [term for term, _ in tree.search(query, radius)]
+                for term in terms:
+                    for source in sources[term]:
+                        candidates[(case_bool, source)].add(text)
+        return candidates
 
     def pipe(
         self,
@@ -270,6 +710,7 @@ class TokenMatcher:
         batch_size: int = 1000,
         return_matches: bool = False,
         as_tuples: bool = False,
+        n_process: int = 1,
     ) -> Generator[Any, None, None]:
         """Match a stream of `Doc` objects, yielding them in turn.
 
@@ -284,6 +725,11 @@ class TokenMatcher:
                 If both return_matches and as_tuples are `True`,
                 the output will be a sequence of ((doc, matches), context) tuples.
                 Default is `False`.
+            n_process: Number of processes to match with.
+                With more than one, batches of batch_size docs are matched
+                by worker processes and the yielded docs are copies
+                rebuilt from the workers' results.
+                `-1` uses all available cores. Default is `1`.
 
         Yields:
             `Doc` objects, in order.
@@ -305,33 +751,16 @@ class TokenMatcher:
             >>> [entry[1] for entry in output]
             [[('DRAGON', 3, 4, None)], [('DRAGON', 3, 4, None)]]
         """
-        if as_tuples:
-            for doc, context in stream:
-                matches = self(doc)
+        for (doc, matches), context in pipe_matches(
+            self, stream, batch_size, n_process, as_tuples
+        ):
+            if as_tuples:
                 if return_matches:
                     yield ((doc, matches), context)
                 else:
                     yield (doc, context)
-        else:
-            for doc in stream:
-                matches = self(doc)
+            else:
                 if return_matches:
                     yield (doc, matches)
                 else:
                     yield doc
-
-
-def _spacyfy(
-    matches: List[List[Optional[Tuple[str, str]]]], pattern: List[Dict[str, Any]]
-) -> List[List[Dict[str, Any]]]:
-    """Turns token searcher matches into spaCy `Matcher` compatible patterns."""
-    new_patterns = []
-    if matches:
-        for match in matches:
-            new_pattern = deepcopy(pattern)
-            for i, token in enumerate(match):
-                if token:
-                    del new_pattern[i][token[0]]
-                    new_pattern[i]["TEXT"] = token[1]
-            new_patterns.append(new_pattern)
-    return new_patterns
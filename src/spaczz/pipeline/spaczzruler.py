@@ -109,7 +109,7 @@ class SpaczzRuler:
         default_names = (
             "spaczz_fuzzy_defaults",
             "spaczz_regex_defaults",
-            "spacy_token_defaults",
+            "spaczz_token_defaults",
         )
         self.defaults = {}
         for name in default_names:
@@ -123,17 +123,8 @@ class SpaczzRuler:
                             f"not {type(cfg[name])}.",
                         )
                     )
-        self.fuzzy_matcher = FuzzyMatcher(
-            nlp.vocab, **self.defaults.get("spaczz_fuzzy_defaults", {}),
-        )
-        self.regex_matcher = RegexMatcher(
-            nlp.vocab,
-            cfg.get("spaczz_regex_config", "default"),
-            **self.defaults.get("spaczz_regex_defaults", {}),
-        )
-        self.token_matcher = TokenMatcher(
-            nlp.vocab, **self.defaults.get("spaczz_token_defaults", {})
-        )
+        self._regex_config = cfg.get("spaczz_regex_config", "default")
+        self._reset_matchers()
         patterns = cfg.get("spaczz_patterns")
         if patterns is not None:
             self.add_patterns(patterns)
@@ -540,8 +531,9 @@ class SpaczzRuler:
         """
         cfg = srsly.msgpack_loads(patterns_bytes)
         if isinstance(cfg, dict):
-            self.add_patterns(cfg.get("spaczz_patterns", cfg))
             self.defaults = cfg.get("spaczz_defaults", {})
+            self._reset_matchers()
+            self.add_patterns(cfg.get("spaczz_patterns", cfg))
             self.overwrite = cfg.get("spaczz_overwrite", False)
             self.ent_id_sep = cfg.get("spaczz_ent_id_sep", DEFAULT_ENT_ID_SEP)
         else:
@@ -624,6 +616,7 @@ class SpaczzRuler:
             self.overwrite = cfg.get("spaczz_overwrite", False)
             self.defaults = cfg.get("spaczz_defaults", {})
             self.ent_id_sep = cfg.get("spaczz_ent_id_sep", DEFAULT_ENT_ID_SEP)
+            self._reset_matchers()
             read_from_disk(path, deserializers_patterns, {})
         return self
 
@@ -682,6 +675,26 @@ class SpaczzRuler:
             label = "{}{}{}".format(label, self.ent_id_sep, ent_id)
         return label
 
+    def _reset_matchers(self) -> None:
+        """Replaces the matchers with ones built from the current defaults.
+
+        Matcher settings, such as the fuzzy matcher's `max_edit_distance`,
+        are saved with the defaults, so a loaded ruler matches its patterns
+        the same way once they are added. The regex config is not saved
+        and is kept from the ruler's cfg.
+        """
+        self.fuzzy_matcher = FuzzyMatcher(
+            self.nlp.vocab, **self.defaults.get("spaczz_fuzzy_defaults", {})
+        )
+        self.regex_matcher = RegexMatcher(
+            self.nlp.vocab,
+            self._regex_config,
+            **self.defaults.get("spaczz_regex_defaults", {}),
+        )
+        self.token_matcher = TokenMatcher(
+            self.nlp.vocab, **self.defaults.get("spaczz_token_defaults", {})
+        )
+
     def _split_label(self, label: str) -> Tuple[str, Union[str, None]]:
         """Split Entity label into ent_label and ent_id if it contains self.ent_id_sep.
 
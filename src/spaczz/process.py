@@ -1,8 +1,26 @@
 """Module for various text/doc processing functions/classes."""
+from collections import OrderedDict
 from itertools import tee
-from typing import Any, Callable, Dict, Iterable
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+from weakref import WeakKeyDictionary
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, levenshtein, utils
+from spacy.attrs import IDX, LENGTH
 from spacy.tokens import Doc
 
 
@@ -15,6 +33,117 @@ def map_chars_to_tokens(doc: Doc) -> Dict[int, int]:
     return chars_to_tokens
 
 
+def map_token_offsets(doc: Doc) -> Tuple[List[int], List[int]]:
+    """Maps tokens in a `Doc` object to their start and end character offsets."""
+    starts = [token.idx for token in doc]
+    ends = [token.idx + len(token) for token in doc]
+    return starts, ends
+
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+
+class DocCache:
+    """Preprocessed views of a `Doc` shared by every matcher and pattern.
+
+    Get one with `doc_cache()` so matchers and searchers called on the same
+    doc, e.g. by the `SpaczzRuler`, lower-case its text, map its tokens
+    and build other derived data only once.
+    Derived data is computed lazily and must not be modified.
+
+    Attributes:
+        bounds: Start character offset and length of each token
+            in the doc when the cache was built.
+        text: The doc text.
+        starts: Start character offset of each token.
+        ends: End character offset of each token.
+        _memo: Derived data by key.
+    """
+
+    def __init__(self, doc: Doc) -> None:
+        """Initializes the cache with the doc's text and token offsets.
+
+        Args:
+            doc: The `Doc` object to preprocess.
+        """
+        self.bounds = doc.to_array([IDX, LENGTH])
+        self.text = doc.text
+        self.starts, self.ends = map_token_offsets(doc)
+        self._memo: Dict[Any, Any] = {}
+
+    def is_current(self, doc: Doc) -> bool:
+        """Whether doc has the token boundaries the cache was built with."""
+        return np.array_equal(self.bounds, doc.to_array([IDX, LENGTH]))
+
+    def memo(self, key: Any, factory: Callable[[], T]) -> T:
+        """Returns the data cached under key, computing it with factory once."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = factory()
+            return value
+
+    @property
+    def lower(self) -> str:
+        """The lower-cased doc text."""
+        return self.memo("lower", self.text.lower)
+
+    @property
+    def chars_to_tokens(self) -> Dict[int, int]:
+        """Maps the character offsets of token text to token indices."""
+        return self.memo(
+            "chars_to_tokens",
+            lambda: {
+                i: token
+                for token, (start, end) in enumerate(zip(self.starts, self.ends))
+                for i in range(start, end)
+            },
+        )
+
+    @property
+    def token_texts(self) -> List[str]:
+        """The text of each token."""
+        return self.memo(
+            "token_texts",
+            lambda: [
+                self.text[start:end] for start, end in zip(self.starts, self.ends)
+            ],
+        )
+
+
+_doc_caches: "WeakKeyDictionary[Doc, DocCache]" = WeakKeyDictionary()
+
+
+def doc_cache(doc: Doc) -> DocCache:
+    """Returns the shared preprocessing cache of a `Doc` object.
+
+    Caches live as long as their doc and are rebuilt if retokenizing
+    the doc changed its token boundaries. They are kept outside the doc,
+    so `Doc.user_data` and doc serialization are unaffected.
+
+    Args:
+        doc: The `Doc` object being matched over.
+
+    Returns:
+        The doc's `DocCache`.
+
+    Example:
+        >>> import spacy
+        >>> from spaczz.process import doc_cache
+        >>> nlp = spacy.blank("en")
+        >>> doc = nlp("Hello World")
+        >>> doc_cache(doc).lower
+        'hello world'
+        >>> doc_cache(doc) is doc_cache(doc)
+        True
+    """
+    cache = _doc_caches.get(doc)
+    if cache is None or not cache.is_current(doc):
+        cache = _doc_caches[doc] = DocCache(doc)
+    return cache
+
+
 def n_wise(iterable: Iterable[Any], n: int) -> Iterable[Any]:
     """Iterates over an iterables in slices of length n by one step at a time."""
     iterables = tee(iterable, n)
@@ -24,6 +153,435 @@ def n_wise(iterable: Iterable[Any], n: int) -> Iterable[Any]:
     return zip(*iterables)
 
 
+def qgrams(text: str, q: int = 3) -> Set[str]:
+    """Returns the distinct character q-grams of text."""
+    return {text[i : i + q] for i in range(len(text) - q + 1)}
+
+
+def deletes(text: str, max_deletes: int = 1) -> Set[str]:
+    """Returns the strings made by deleting up to max_deletes characters of text.
+
+    Two strings within `max_deletes` Levenshtein edits of each other
+    always share at least one such deletion variant (SymSpell).
+
+    Args:
+        text: String to delete characters from.
+        max_deletes: Maximum number of characters to delete. Default is `1`.
+
+    Returns:
+        The set of deletion variants, including text itself.
+
+    Example:
+        >>> from spaczz.process import deletes
+        >>> sorted(deletes("abc"))
+        ['ab', 'abc', 'ac', 'bc']
+    """
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_deletes):
+        frontier = {
+            variant[:i] + variant[i + 1 :]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+def indel_ratio_bound(len_a: int, len_b: int) -> float:
+    """Returns the highest normalized InDel ratio possible for two string lengths.
+
+    Turning one string into the other takes at least `abs(len_a - len_b)`
+    insertions or deletions, so the ratio can never exceed
+    `200 * min(len_a, len_b) / (len_a + len_b)`.
+
+    Args:
+        len_a: Length of the first string.
+        len_b: Length of the second string.
+
+    Returns:
+        The upper bound of the ratio between 0 and 100.
+
+    Example:
+        >>> from spaczz.process import indel_ratio_bound
+        >>> indel_ratio_bound(3, 9)
+        50.0
+    """
+    total = len_a + len_b
+    if not total:
+        return 100.0
+    return 200 * min(len_a, len_b) / total
+
+
+def myers_search(
+    pattern: str, text: str, max_edits: int, anchored: bool = False
+) -> List[Tuple[int, int]]:
+    """Finds where in text a substring within max_edits edits of pattern ends.
+
+    Runs Myers' bit-parallel version of Sellers' dynamic programming
+    algorithm, which tracks a whole column of the Levenshtein
+    distance matrix in a couple of integers, so each character of text
+    costs a handful of bitwise operations regardless of max_edits.
+
+    Args:
+        pattern: String to search for.
+        text: String to search over.
+        max_edits: Maximum Levenshtein distance to report.
+        anchored: Whether substrings must also start at the beginning
+            of text, i.e. report the distances of text prefixes.
+            Default is `False`.
+
+    Returns:
+        (end, distance) tuples of every end offset (exclusive) in text
+        where the best matching substring is within max_edits.
+
+    Example:
+        >>> from spaczz.process import myers_search
+        >>> myers_search("spacy", "a spaczz doc", 1)
+        [(6, 1), (7, 1)]
+    """
+    m = len(pattern)
+    if not m:
+        return [(end, 0) for end in range(len(text) + 1)]
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | 1 << i
+    mask = (1 << m) - 1
+    high = 1 << (m - 1)
+    carry = 1 if anchored else 0
+    pv = mask
+    mv = 0
+    score = m
+    ends = []
+    if anchored and score <= max_edits:
+        ends.append((0, score))
+    for j, char in enumerate(text):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1 | carry) & mask
+        mh = (mh << 1) & mask
+        pv = mh | ~(xv | ph) & mask
+        mv = ph & xv
+        if score <= max_edits:
+            ends.append((j + 1, score))
+    return ends
+
+
+def max_indel_distance(length: int, min_r: int) -> Optional[int]:
+    """Returns the largest InDel distance at which min_r is still reachable.
+
+    A string of length `n` within InDel distance `d` of one of the given
+    length `m` has a "simple" ratio of at most `100 * (1 - d / (m + n))`,
+    and `n <= m + d`, so reaching a cutoff `c` (as a fraction)
+    requires `d <= 2 * m * (1 - c) / c`. The Levenshtein distance
+    is never larger than the InDel distance, so this bounds it too.
+
+    Args:
+        length: Length of the string being matched against.
+        min_r: Minimum "simple" ratio.
+
+    Returns:
+        The distance bound, or `None` if every distance can reach min_r.
+
+    Example:
+        >>> from spaczz.process import max_indel_distance
+        >>> max_indel_distance(10, 75)
+        6
+    """
+    cutoff = score_cutoff(min_r) / 100
+    if not cutoff:
+        return None
+    return int(2 * length * (1 - cutoff) / cutoff + 1e-9)
+
+
+class BKTree:
+    """Burkhard-Keller tree of strings under the Levenshtein distance.
+
+    Each node's children are keyed by their distance to it,
+    so by the triangle inequality a search only descends into children
+    whose key is within the radius of the query's distance to the node.
+
+    Attributes:
+        _root: The root (text, children) node, or `None` if empty.
+        _size: Number of distinct strings in the tree.
+    """
+
+    def __init__(self, items: Iterable[str] = ()) -> None:
+        """Initializes a BK-tree with the given strings.
+
+        Args:
+            items: Strings to add. Default is no strings.
+        """
+        self._root: Optional[Tuple[str, Dict[int, Any]]] = None
+        self._size = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        """The number of distinct strings in the tree."""
+        return self._size
+
+    def add(self, item: str) -> None:
+        """Adds a string to the tree if it is not already in it."""
+        if self._root is None:
+            self._root = (item, {})
+            self._size += 1
+            return
+        text, children = self._root
+        while True:
+            distance = levenshtein.distance(item, text)
+            if not distance:
+                return
+            if distance not in children:
+                children[distance] = (item, {})
+                self._size += 1
+                return
+            text, children = children[distance]
+
+    def search(self, item: str, radius: int) -> List[Tuple[str, int]]:
+        """Finds the strings within radius Levenshtein edits of item.
+
+        Args:
+            item: String to search for.
+            radius: Maximum Levenshtein distance.
+
+        Returns:
+            (string, distance) tuples of the strings found.
+
+        Example:
+            >>> from spaczz.process import BKTree
+            >>> tree = BKTree(["spacy", "spaczz", "regex"])
+            >>> sorted(tree.search("spaczy", 1))
+            [('spacy', 1), ('spaczz', 1)]
+        """
+        found = []
+        nodes = [self._root] if self._root is not None else []
+        while nodes:
+            text, children = nodes.pop()
+            distance = levenshtein.distance(item, text)
+            if distance <= radius:
+                found.append((text, distance))
+            nodes.extend(
+                child
+                for key, child in children.items()
+                if distance - radius <= key <= distance + radius
+            )
+        return found
+
+
+class LRUCache(Generic[K, T]):
+    """Bounded mapping that evicts its least recently used entries.
+
+    Attributes:
+        maxsize: Maximum number of entries kept.
+            `None` keeps every entry and `0` keeps none.
+        stats: Running totals of lookup "hits" and "misses"
+            and of "evictions".
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        """Initializes an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept.
+                `None` keeps every entry and `0` keeps none.
+                Default is `128`.
+
+        Raises:
+            ValueError: maxsize cannot be negative.
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize cannot be negative.")
+        self.maxsize = maxsize
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: "OrderedDict[K, T]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """The number of entries in the cache."""
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups answered from the cache."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def get(self, key: K) -> Optional[T]:
+        """Returns the value cached under key, or `None` if there is none.
+
+        Args:
+            key: The key to look up.
+
+        Returns:
+            The cached value, or `None` if key is not cached.
+
+        Example:
+            >>> from spaczz.process import LRUCache
+            >>> cache = LRUCache(maxsize=1)
+            >>> cache.put("a", 1)
+            >>> cache.put("b", 2)
+            >>> cache.get("a"), cache.get("b")
+            (None, 2)
+            >>> cache.stats
+            {'hits': 1, 'misses': 1, 'evictions': 1}
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def put(self, key: K, value: T) -> None:
+        """Caches value under key, evicting the least recently used if full."""
+        if self.maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Removes every entry, keeping the stats."""
+        self._entries.clear()
+
+
+class LengthBound(NamedTuple):
+    """Closed-form upper bound of a fuzzy matching function's ratio.
+
+    Attributes:
+        bound: Returns the highest ratio possible between
+            two strings given their (processed) lengths.
+        processor: The string processing the fuzzy matching function
+            applies before comparing, or `None`.
+    """
+
+    bound: Callable[[int, int], float]
+    processor: Optional[Callable[[str], str]] = None
+
+    def len(self, text: str) -> int:
+        """Returns the length of text as seen by the fuzzy matching function."""
+        if self.processor is not None:
+            return len(self.processor(text))
+        return len(text)
+
+    def rules_out(self, len_a: int, len_b: int, min_r: int) -> bool:
+        """Whether strings of these lengths can never reach min_r."""
+        return min_r > 0 and self.bound(len_a, len_b) < score_cutoff(min_r)
+
+
+def score_cutoff(min_r: int) -> float:
+    """Returns the rapidfuzz score cutoff for ratios that can round up to min_r."""
+    return max(min_r - 0.5, 0)
+
+
+# rapidfuzz scorers that apply score_cutoff exactly. WRatio and
+# token_set_ratio can return 0 for ratios above the cutoff,
+# so other scorers are run without one and thresholded after.
+_CUTOFF_SCORERS = frozenset(
+    {
+        fuzz.ratio,
+        fuzz.partial_ratio,
+        fuzz.token_sort_ratio,
+        fuzz.partial_token_set_ratio,
+        fuzz.partial_token_sort_ratio,
+        fuzz.QRatio,
+        fuzz.quick_lev_ratio,
+    }
+)
+
+
+def cutoff_ratio(func: Callable[..., float], a: str, b: str, min_r: int = 0) -> int:
+    """Returns the rounded fuzzy ratio between a and b, or 0 if below min_r.
+
+    min_r is passed to func as a score cutoff so rapidfuzz
+    can stop early when the ratio cannot reach it, unless func
+    does not apply score cutoffs exactly.
+
+    Args:
+        func: A rapidfuzz scoring function.
+        a: First string for comparison.
+        b: Second string for comparison.
+        min_r: Minimum ratio to return. Default is `0`.
+
+    Returns:
+        The rounded ratio, or 0 if it is below min_r.
+
+    Example:
+        >>> from rapidfuzz import fuzz
+        >>> from spaczz.process import cutoff_ratio
+        >>> cutoff_ratio(fuzz.ratio, "spaczz", "spacy", 80)
+        0
+    """
+    if func in _CUTOFF_SCORERS:
+        ratio = round(func(a, b, score_cutoff=score_cutoff(min_r)))
+    else:
+        ratio = round(func(a, b))
+    return ratio if ratio >= min_r else 0
+
+
+def score_matrix(
+    queries: Sequence[str],
+    choices: Sequence[str],
+    scorer: Callable[..., float],
+    score_cutoff: float = 0,
+    length_bound: Optional[LengthBound] = None,
+) -> np.ndarray:
+    """Scores every query against every choice in one batch.
+
+    Pairs whose lengths rule out reaching score_cutoff are skipped.
+
+    Args:
+        queries: Strings to score, one row each.
+        choices: Strings to score against, one column each.
+        scorer: A rapidfuzz scoring function.
+        score_cutoff: Scores below this are returned as 0,
+            which lets scorer stop early. Default is `0`.
+        length_bound: Optional ratio bound of scorer, used to skip
+            pairs whose lengths rule out reaching score_cutoff.
+            Default is `None`.
+
+    Returns:
+        A (len(queries), len(choices)) array of rounded scores.
+
+    Example:
+        >>> from rapidfuzz import fuzz
+        >>> from spaczz.process import score_matrix
+        >>> score_matrix(["spacy"], ["spaczz", "spacy"], fuzz.ratio)
+        array([[ 73., 100.]])
+    """
+    cutoff = score_cutoff if scorer in _CUTOFF_SCORERS else 0
+    scores = np.zeros((len(queries), len(choices)), dtype=np.float64)
+    candidates: Iterable[int]
+    if length_bound is not None and score_cutoff > 0:
+        choice_lens = [length_bound.len(choice) for choice in choices]
+    for i, query in enumerate(queries):
+        if length_bound is not None and score_cutoff > 0:
+            query_len = length_bound.len(query)
+            candidates = [
+                j
+                for j, choice_len in enumerate(choice_lens)
+                if length_bound.bound(query_len, choice_len) >= score_cutoff
+            ]
+        else:
+            candidates = range(len(choices))
+        for j in candidates:
+            scores[i, j] = scorer(query, choices[j], score_cutoff=cutoff)
+    if cutoff < score_cutoff:
+        scores[scores < score_cutoff] = 0
+    return np.rint(scores)
+
+
 class FuzzyFuncs:
     """Container class housing fuzzy matching functions.
 
@@ -48,6 +606,10 @@ class FuzzyFuncs:
             "quick_lev" = `quick_lev_ratio`
             This is limited to "simple", "quick", and "quick_lev"
             if match_type = "token".
+        _length_bounds (Dict[str, LengthBound]):
+            Closed-form ratio upper bounds based on string lengths
+            for the fuzzy matching functions that have one:
+            "simple", "quick", and "quick_lev".
     """
 
     def __init__(self, match_type: str = "phrase") -> None:
@@ -82,6 +644,11 @@ class FuzzyFuncs:
             }
         else:
             raise ValueError("match_type must be either 'phrase' or 'token'.")
+        self._length_bounds: Dict[str, LengthBound] = {
+            "simple": LengthBound(indel_ratio_bound),
+            "quick": LengthBound(indel_ratio_bound, utils.default_process),
+            "quick_lev": LengthBound(indel_ratio_bound, utils.default_process),
+        }
 
     def get(self, fuzzy_func: str) -> Callable[[str, str], float]:
         """Returns a fuzzy matching function based on it's key name.
@@ -114,3 +681,23 @@ class FuzzyFuncs:
                     f"{list(self._fuzzy_funcs.keys())}",
                 )
             )
+
+    def get_length_bound(self, fuzzy_func: str) -> Optional[LengthBound]:
+        """Returns the length based ratio bound of a fuzzy matching function.
+
+        Candidates whose lengths rule out reaching a minimum ratio
+        can be skipped without running the fuzzy matching function.
+
+        Args:
+            fuzzy_func: Key name of the fuzzy matching function.
+
+        Returns:
+            A `LengthBound` or `None` if the function has no such bound.
+
+        Example:
+            >>> from spaczz.process import FuzzyFuncs
+            >>> ff = FuzzyFuncs()
+            >>> ff.get_length_bound("simple").bound(3, 9)
+            50.0
+        """
+        return self._length_bounds.get(fuzzy_func.lower())
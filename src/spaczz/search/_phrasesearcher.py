@@ -1,6 +1,7 @@
 """Module for _PhraseSearcher: flexible phrase searching in spaCy `Doc` objects."""
-from itertools import chain
-from typing import Any, Dict, List, Tuple, Union
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 import warnings
 
 from spacy.tokens import Doc, Span, Token
@@ -8,6 +9,81 @@ from spacy.vocab import Vocab
 
 from ..exceptions import FlexWarning
 
+# Scores doc[start:end] against a query. Scores below min_r may be returned
+# as any value below min_r, e.g. 0 if the scorer stopped early.
+WindowScorer = Callable[[int, int, int], int]
+
+
+class MatchSettings(NamedTuple):
+    """`match()` keyword arguments split by `_PhraseSearcher._split_kwargs()`.
+
+    Attributes:
+        flex: Number of tokens to move match span boundaries.
+        min_r1: Minimum match ratio of the initial search.
+        min_r2: Minimum match ratio of match optimization.
+        cluster: Whether to cluster overlapping initial matches.
+        top_k: Optional number of best matches to return.
+        compare_kwargs: The remaining kwargs, passed to the comparisons.
+    """
+
+    flex: Union[str, int]
+    min_r1: int
+    min_r2: int
+    cluster: bool
+    top_k: Optional[int]
+    compare_kwargs: Dict[str, Any]
+
+
+class ScoreMemo:
+    """Memoizes a `WindowScorer` by window (start, end) indices.
+
+    One memo is shared by the scan and every optimization of a query
+    against a doc, so spans that several flexed windows land on
+    are only scored once.
+
+    Since scorers may return any value below the minimum ratio they were
+    called with, each entry also records that cutoff. A cached score below
+    its cutoff is only reused for calls with the same or a higher minimum ratio.
+
+    Attributes:
+        hits: Number of calls answered from the memo.
+        misses: Number of calls passed to the wrapped scorer.
+    """
+
+    def __init__(self, scorer: WindowScorer) -> None:
+        """Initializes the memo around a window scorer.
+
+        Args:
+            scorer: The window scoring function to memoize.
+        """
+        self.hits = 0
+        self.misses = 0
+        self._scorer = scorer
+        self._scores: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def __call__(self, start: int, end: int, min_r: int = 0) -> int:
+        """Returns the memoized score of the window, scoring it if needed."""
+        cached = self._scores.get((start, end))
+        if cached is not None:
+            ratio, cutoff = cached
+            if ratio >= cutoff or min_r >= cutoff:
+                self.hits += 1
+                return ratio
+        self.misses += 1
+        ratio = self._scorer(start, end, min_r)
+        self._scores[(start, end)] = (ratio, min_r)
+        return ratio
+
+    def seed(self, match_values: Dict[int, int], length: int) -> None:
+        """Records exact scores of windows of length tokens from a scan.
+
+        Args:
+            match_values: Dictionary of window start indices and match ratios.
+            length: Number of tokens in each window.
+        """
+        for pos, ratio in match_values.items():
+            self._scores[(pos, pos + length)] = (ratio, 0)
+
 
 class _PhraseSearcher:
     """Base class for flexible phrase searching in spaCy `Doc` objects.
@@ -19,6 +95,9 @@ class _PhraseSearcher:
     `SimilaritySearcher`.
 
     Attributes:
+        memo_stats (Dict[str, int]): Running totals of window scores
+            answered from ("hits") or missing in ("misses")
+            the per-query `ScoreMemo`.
         vocab (Vocab): The shared vocabulary.
             Included for consistency and potential future-state.
     """
@@ -34,7 +113,9 @@ class _PhraseSearcher:
                 currently and do not share vocabulary
                 with spaCy pipelines.
         """
+        self.memo_stats = {"hits": 0, "misses": 0}
         self.vocab = vocab
+        self._memo_stats_lock = Lock()
 
     def compare(
         self,
@@ -82,6 +163,8 @@ class _PhraseSearcher:
         min_r1: int = 50,
         min_r2: int = 75,
         *args: Any,
+        cluster: bool = False,
+        top_k: Optional[int] = None,
         **kwargs: Any,
     ) -> List[Tuple[int, int, int]]:
         """Returns phrase matches in a `Doc` object.
@@ -115,6 +198,16 @@ class _PhraseSearcher:
                 to ensure only quality matches are returned.
                 Default is `75`.
             *args: Overflow for child positional arguments.
+            cluster: Whether to group initial matches whose spans overlap
+                and only optimize the best of each group, instead of
+                optimizing every initial match. Faster, but two true matches
+                close enough for their initial spans to overlap
+                can be reduced to one. Default is `False`.
+            top_k: If set, only the first top_k matches are returned.
+                Once top_k matches are known, initial matches
+                are only optimized against the ratio of the top_k-th best,
+                which lets the final comparisons stop early.
+                Default is `None`.
             **kwargs: Overflow for child keyword arguments.
 
         Returns:
@@ -130,24 +223,315 @@ class _PhraseSearcher:
         if not isinstance(query, Doc):
             raise TypeError("query must be a Doc object.")
         flex = self._calc_flex(query, flex)
-        match_values = self._scan(doc, query, min_r1, *args, **kwargs)
-        if match_values:
+        memo = ScoreMemo(self._window_scorer(doc, query, *args, **kwargs))
+        match_values = self._scan(doc, query, min_r1, *args, scorer=memo, **kwargs)
+        matches = self._optimize_matches(
+            doc,
+            query,
+            match_values,
+            flex,
+            min_r2,
+            *args,
+            cluster=cluster,
+            top_k=top_k,
+            scorer=memo,
+            **kwargs,
+        )
+        self._record_memo(memo)
+        return matches
+
+    def match_many(
+        self,
+        doc: Doc,
+        queries: List[Doc],
+        kwargs: List[Dict[str, Any]],
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+    ) -> List[List[Tuple[int, int, int]]]:
+        """Returns phrase matches in a `Doc` object for several queries at once.
+
+        Equivalent to calling `match()` for each query with its kwargs,
+        but queries that share comparison settings (everything except
+        flex, min_r1 and min_r2) are scanned over doc together,
+        which lets child searchers score all of their windows in one batch.
+
+        Args:
+            doc: `Doc` object to search over.
+            queries: `Doc` objects to match against doc.
+            kwargs: One dictionary of `match()` keyword arguments per query.
+            candidates: Optional start indices of the `len(query)` windows
+                each query's initial search should be limited to,
+                e.g. from a pre-filter. `None` entries search every window.
+                Default is `None`.
+
+        Returns:
+            A list of `match()` results, one for each query.
+
+        Raises:
+            TypeError: doc must be a `Doc` object.
+            TypeError: queries must be `Doc` objects.
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.search import FuzzySearcher
+            >>> nlp = spacy.blank("en")
+            >>> searcher = FuzzySearcher(nlp.vocab)
+            >>> doc = nlp("Ridley Scott was the director of Alien.")
+            >>> searcher.match_many(doc, [nlp("Scot"), nlp("Alien")], [{}, {}])
+            [[(1, 2, 89)], [(6, 7, 100)]]
+        """
+        if not isinstance(doc, Doc):
+            raise TypeError("doc must be a Doc object.")
+        groups: Dict[Any, List[int]] = defaultdict(list)
+        settings = []
+        for i, (query, query_kwargs) in enumerate(zip(queries, kwargs)):
+            if not isinstance(query, Doc):
+                raise TypeError("query must be a Doc object.")
+            query_settings = self._split_kwargs(**query_kwargs)
+            settings.append(query_settings)
+            try:
+                key: Any = tuple(sorted(query_settings.compare_kwargs.items()))
+                hash(key)
+            except TypeError:
+                key = i
+            groups[key].append(i)
+        results: List[List[Tuple[int, int, int]]] = [[] for _ in queries]
+        for indices in groups.values():
+            compare_kwargs = settings[indices[0]].compare_kwargs
+            all_match_values = self._scan_many(
+                doc,
+                [queries[i] for i in indices],
+                [settings[i].min_r1 for i in indices],
+                candidates=[candidates[i] for i in indices] if candidates else None,
+                **compare_kwargs,
+            )
+            for i, match_values in zip(indices, all_match_values):
+                if match_values:
+                    memo = ScoreMemo(
+                        self._window_scorer(doc, queries[i], **compare_kwargs)
+                    )
+                    memo.seed(match_values, len(queries[i]))
+                    results[i] = self._optimize_matches(
+                        doc,
+                        queries[i],
+                        match_values,
+                        self._calc_flex(queries[i], settings[i].flex),
+                        settings[i].min_r2,
+                        cluster=settings[i].cluster,
+                        top_k=settings[i].top_k,
+                        scorer=memo,
+                        **compare_kwargs,
+                    )
+                    self._record_memo(memo)
+        return results
+
+    def _optimize_matches(
+        self,
+        doc: Doc,
+        query: Doc,
+        match_values: Union[Dict[int, int], None],
+        flex: int,
+        min_r2: int,
+        *args: Any,
+        cluster: bool = False,
+        top_k: Optional[int] = None,
+        scorer: Optional[WindowScorer] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[int, int, int]]:
+        """Optimizes, sorts and filters the potential matches from a scan.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            match_values: Dictionary of initial match spans
+                start indices and match ratios, or `None`.
+            flex: Number of tokens to move match span boundaries
+                left and right during match optimization.
+            min_r2: Minimum match ratio required
+                to pass optimization.
+            *args: Overflow for child positional arguments.
+            cluster: Whether to only optimize the best scoring
+                of each group of overlapping initial match spans.
+                See `_cluster()`. Default is `False`.
+            top_k: Optional number of best matches to return.
+                See `_optimize_top_k()`. Default is `None`.
+            scorer: Optional window scoring function from `_window_scorer()`.
+                One is created for doc and query if not provided.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of tuples of match span start indices,
+            end indices, and match ratios.
+        """
+        if not match_values:
+            return []
+        if scorer is None:
+            scorer = self._window_scorer(doc, query, *args, **kwargs)
+        if cluster:
+            positions = self._cluster(match_values, len(query))
+        else:
             positions = list(match_values.keys())
-            matches_w_nones = [
+        if top_k:
+            return self._optimize_top_k(
+                doc,
+                query,
+                match_values,
+                positions,
+                flex,
+                min_r2,
+                top_k,
+                *args,
+                scorer=scorer,
+                **kwargs,
+            )
+        matches_w_nones = [
+            self._optimize(
+                doc,
+                query,
+                match_values,
+                pos,
+                flex,
+                min_r2,
+                *args,
+                scorer=scorer,
+                **kwargs,
+            )
+            for pos in positions
+        ]
+        matches = [match for match in matches_w_nones if match]
+        if matches:
+            sorted_matches = sorted(matches, key=lambda x: (-x[2], x[0]))
+            filtered_matches = self._filter_overlapping_matches(sorted_matches)
+            return filtered_matches
+        else:
+            return []
+
+    def _optimize_top_k(
+        self,
+        doc: Doc,
+        query: Doc,
+        match_values: Dict[int, int],
+        positions: List[int],
+        flex: int,
+        min_r2: int,
+        top_k: int,
+        *args: Any,
+        scorer: Optional[WindowScorer] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[int, int, int]]:
+        """Returns the top_k best matches from optimizing the potential matches.
+
+        Potential matches are optimized in descending order of initial ratio
+        so good matches are found early. Once top_k non-overlapping matches
+        are known, the ratio of the top_k-th best becomes the minimum ratio
+        for further optimizations, since a match below it can
+        never make the top_k. Only matches at or above that ratio are kept,
+        so the number of matches held stays small.
+        Potential matches whose upper bound from `_optimize_bounds()`
+        is below that ratio are skipped without being optimized.
+        Matches with the same ratio and start index are ordered
+        by their position in positions, as `_optimize_matches()`
+        orders them, so the result is the same as its first top_k matches.
+
+        A match found later can overlap several kept matches and leave
+        fewer than top_k, after lower ratio matches were already dropped.
+        Every potential match is then optimized against min_r2 instead.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            match_values: Dictionary of initial match spans
+                start indices and match ratios.
+            positions: Start indices of the initial matches to optimize.
+            flex: Number of tokens to move match span boundaries
+                left and right during match optimization.
+            min_r2: Minimum match ratio required
+                to pass optimization.
+            top_k: Number of best matches to return.
+            *args: Overflow for child positional arguments.
+            scorer: Optional window scoring function from `_window_scorer()`.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of at most top_k tuples of match span start indices,
+            end indices, and match ratios.
+        """
+        found: List[Tuple[int, int, int]] = []
+        order: Dict[Tuple[int, int, int], int] = {}
+        threshold = min_r2
+        bounds = self._optimize_bounds(doc, query, positions, flex, *args, **kwargs)
+        ranked = sorted(enumerate(positions), key=lambda p: (-match_values[p[1]], p[0]))
+        for i, pos in ranked:
+            # Rounded ratios reach threshold from threshold - 0.5.
+            if bounds is not None and bounds[pos] < threshold - 0.5:
+                continue
+            match = self._optimize(
+                doc,
+                query,
+                match_values,
+                pos,
+                flex,
+                threshold,
+                *args,
+                scorer=scorer,
+                **kwargs,
+            )
+            if match:
+                order[match] = min(order.get(match, i), i)
+                found.append(match)
+                found.sort(key=lambda x: (-x[2], x[0], order[x]))
+                kept = self._filter_overlapping_matches(found)
+                if len(kept) >= top_k:
+                    threshold = max(min_r2, kept[top_k - 1][2])
+                    found = [m for m in found if m[2] >= threshold]
+        kept = self._filter_overlapping_matches(found)
+        if len(kept) < top_k and threshold > min_r2:
+            matches = [
                 self._optimize(
-                    doc, query, match_values, pos, flex, min_r2, *args, **kwargs,
+                    doc,
+                    query,
+                    match_values,
+                    pos,
+                    flex,
+                    min_r2,
+                    *args,
+                    scorer=scorer,
+                    **kwargs,
                 )
                 for pos in positions
             ]
-            matches = [match for match in matches_w_nones if match]
-            if matches:
-                sorted_matches = sorted(matches, key=lambda x: (-x[2], x[0]))
-                filtered_matches = self._filter_overlapping_matches(sorted_matches)
-                return filtered_matches
-            else:
-                return []
-        else:
-            return []
+            found = [match for match in matches if match]
+            found.sort(key=lambda x: (-x[2], x[0]))
+            kept = self._filter_overlapping_matches(found)
+        return kept[:top_k]
+
+    def _optimize_bounds(
+        self,
+        doc: Doc,
+        query: Doc,
+        positions: List[int],
+        flex: int,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Optional[Dict[int, float]]:
+        """Returns upper bounds on the optimized ratio of potential matches.
+
+        The base implementation has no bounds.
+        Child classes can override this if their comparison allows
+        cheaply bounding the ratio of every span an optimization
+        could return.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            positions: Start indices of the initial matches.
+            flex: Number of tokens match span boundaries may move.
+            *args: Overflow for child positional arguments.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A dictionary of start index, unrounded ratio bound pairs or `None`.
+        """
+        return None
 
     def _optimize(
         self,
@@ -158,6 +542,7 @@ class _PhraseSearcher:
         flex: int,
         min_r2: int,
         *args: Any,
+        scorer: Optional[WindowScorer] = None,
         **kwargs: Any,
     ) -> Union[Tuple[int, int, int], None]:
         """Optimizes a potential match by flexing match span boundaries.
@@ -181,6 +566,8 @@ class _PhraseSearcher:
                 to pass optimization. This should be high enough
                 to only return quality matches.
             *args: Overflow for child positional arguments.
+            scorer: Optional window scoring function from `_window_scorer()`.
+                One is created for doc and query if not provided.
             **kwargs: Overflow for child keyword arguments.
 
         Returns:
@@ -188,6 +575,8 @@ class _PhraseSearcher:
             right boudary index, and match ratio
             or `None`.
         """
+        if scorer is None:
+            scorer = self._window_scorer(doc, query, *args, **kwargs)
         p_l, bp_l = [pos] * 2
         p_r, bp_r = [pos + len(query)] * 2
         bmv_l = match_values[p_l]
@@ -195,36 +584,42 @@ class _PhraseSearcher:
         if flex:
             for f in range(1, flex + 1):
                 if p_l - f >= 0:
-                    ll = self.compare(query, doc[p_l - f : p_r], *args, **kwargs)
+                    ll = scorer(p_l - f, p_r, bmv_l + 1)
                     if ll > bmv_l:
                         bmv_l = ll
                         bp_l = p_l - f
                 if p_l + f < p_r:
-                    lr = self.compare(query, doc[p_l + f : p_r], *args, **kwargs)
+                    lr = scorer(p_l + f, p_r, bmv_l + 1)
                     if lr > bmv_l:
                         bmv_l = lr
                         bp_l = p_l + f
                 if p_r - f > p_l:
-                    rl = self.compare(query, doc[p_l : p_r - f], *args, **kwargs)
+                    rl = scorer(p_l, p_r - f, bmv_r + 1)
                     if rl > bmv_r:
                         bmv_r = rl
                         bp_r = p_r - f
                 if p_r + f <= len(doc):
-                    rr = self.compare(query, doc[p_l : p_r + f], *args, **kwargs)
+                    rr = scorer(p_l, p_r + f, bmv_r + 1)
                     if rr > bmv_r:
                         bmv_r = rr
                         bp_r = p_r + f
         if bp_l >= bp_r or bp_r <= bp_l:
             return None
         else:
-            r = self.compare(query, doc[bp_l:bp_r], *args, **kwargs)
+            r = scorer(bp_l, bp_r, min_r2)
             if r >= min_r2:
                 return (bp_l, bp_r, r)
             else:
                 return None
 
     def _scan(
-        self, doc: Doc, query: Doc, min_r1: int, *args: Any, **kwargs: Any,
+        self,
+        doc: Doc,
+        query: Doc,
+        min_r1: int,
+        *args: Any,
+        scorer: Optional[WindowScorer] = None,
+        **kwargs: Any,
     ) -> Union[Dict[int, int], None]:
         """Returns a dictionary of potential match start indices and match ratios.
 
@@ -248,6 +643,8 @@ class _PhraseSearcher:
                 Lower min_r1 will result in more fine-grained matching
                 but will run slower.
             *args: Overflow for child positional arguments.
+            scorer: Optional window scoring function from `_window_scorer()`.
+                One is created for doc and query if not provided.
             **kwargs: Overflow for child keyword arguments.
 
         Returns:
@@ -256,9 +653,11 @@ class _PhraseSearcher:
         match_values: Dict[int, int] = dict()
         if not len(query):
             return None
+        if scorer is None:
+            scorer = self._window_scorer(doc, query, *args, **kwargs)
         i = 0
         while i + len(query) <= len(doc):
-            match = self.compare(query, doc[i : i + len(query)], *args, **kwargs)
+            match = scorer(i, i + len(query), min_r1)
             if match >= min_r1:
                 match_values[i] = match
             i += 1
@@ -267,6 +666,83 @@ class _PhraseSearcher:
         else:
             return None
 
+    def _scan_many(
+        self,
+        doc: Doc,
+        queries: List[Doc],
+        min_r1s: List[int],
+        *args: Any,
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+        **kwargs: Any,
+    ) -> List[Union[Dict[int, int], None]]:
+        """Returns `_scan()` results for several queries sharing compare settings.
+
+        The base implementation scans for each query in turn.
+        Child classes can override this to score the windows
+        of all queries in one batch.
+
+        Args:
+            doc: `Doc` object to search over.
+            queries: `Doc` objects to match against doc.
+            min_r1s: Minimum match ratio for each query.
+            *args: Overflow for child positional arguments.
+            candidates: Optional window start indices to restrict
+                each query's scan to. `None` scans every window.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of `_scan()` results, one for each query.
+        """
+        all_match_values = []
+        for i, (query, min_r1) in enumerate(zip(queries, min_r1s)):
+            match_values = self._scan(doc, query, min_r1, *args, **kwargs)
+            query_candidates = candidates[i] if candidates else None
+            if match_values and query_candidates is not None:
+                match_values = {
+                    pos: ratio
+                    for pos, ratio in match_values.items()
+                    if pos in query_candidates
+                } or None
+            all_match_values.append(match_values)
+        return all_match_values
+
+    def _window_scorer(
+        self, doc: Doc, query: Doc, *args: Any, **kwargs: Any
+    ) -> WindowScorer:
+        """Returns a function that scores `doc[start:end]` against query.
+
+        The base implementation builds a `Span` for each window and passes
+        it to `compare()`. Child classes can override this to precompute
+        whatever they need from doc once and score windows without
+        constructing `Span` objects.
+
+        The returned function also takes a minimum ratio. Scorers that
+        support cutoffs can stop early and return any value below it
+        for windows that cannot reach it. The base scorer always
+        returns the window's ratio.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            *args: Overflow for child positional arguments.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A function taking a window start index, end index
+            and minimum ratio and returning the window's match ratio.
+        """
+
+        def scorer(start: int, end: int, min_r: int = 0) -> int:
+            return self.compare(query, doc[start:end], *args, **kwargs)
+
+        return scorer
+
+    def _record_memo(self, memo: ScoreMemo) -> None:
+        """Adds a query's memo hits and misses to `memo_stats`."""
+        with self._memo_stats_lock:
+            self.memo_stats["hits"] += memo.hits
+            self.memo_stats["misses"] += memo.misses
+
     @staticmethod
     def _calc_flex(query: Doc, flex: Union[str, int]) -> int:
         """Returns flex value based on initial value and query.
@@ -337,6 +813,51 @@ class _PhraseSearcher:
             )
         return flex
 
+    @staticmethod
+    def _split_kwargs(
+        flex: Union[str, int] = "default",
+        min_r1: int = 50,
+        min_r2: int = 75,
+        cluster: bool = False,
+        top_k: Optional[int] = None,
+        **kwargs: Any,
+    ) -> MatchSettings:
+        """Splits `match()` kwargs into search settings and compare kwargs."""
+        return MatchSettings(flex, min_r1, min_r2, cluster, top_k, kwargs)
+
+    @staticmethod
+    def _cluster(match_values: Dict[int, int], length: int) -> List[int]:
+        """Returns the best scoring start index of each group of overlapping spans.
+
+        Initial match spans are visited by descending ratio
+        then ascending start index, and a span is kept only if it does not
+        overlap a span already kept, so each run of overlapping
+        initial matches is represented by its best member.
+
+        Args:
+            match_values: Dictionary of initial match spans
+                start indices and match ratios.
+            length: Number of tokens in each initial match span.
+
+        Returns:
+            The kept start indices in ascending order.
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.search import _PhraseSearcher
+            >>> nlp = spacy.blank("en")
+            >>> searcher = _PhraseSearcher(nlp.vocab)
+            >>> searcher._cluster({0: 60, 1: 80, 2: 70, 5: 55}, 2)
+            [1, 5]
+        """
+        occupied = bytearray(max(match_values) + length)
+        positions = []
+        for pos in sorted(match_values, key=lambda p: (-match_values[p], p)):
+            if occupied.find(1, pos, pos + length) == -1:
+                occupied[pos : pos + length] = b"\x01" * length
+                positions.append(pos)
+        return sorted(positions)
+
     @staticmethod
     def _filter_overlapping_matches(
         matches: List[Tuple[int, int, int]]
@@ -347,6 +868,8 @@ class _PhraseSearcher:
         then ascending start index.
         If more than one match span includes the same tokens
         the first of these match spans in matches is kept.
+        Tokens claimed by kept spans are tracked in an occupancy bitmap,
+        so filtering is linear in the total length of the spans.
 
         Args:
             matches: List of match span tuples
@@ -365,9 +888,12 @@ class _PhraseSearcher:
             [(1, 3, 80)]
         """
         filtered_matches: List[Tuple[int, int, int]] = []
+        if not matches:
+            return filtered_matches
+        occupied = bytearray(max(match[1] for match in matches))
         for match in matches:
-            if not set(range(match[0], match[1])).intersection(
-                chain(*[set(range(n[0], n[1])) for n in filtered_matches])
-            ):
+            start, end = match[0], match[1]
+            if occupied.find(1, start, end) == -1:
+                occupied[start:end] = b"\x01" * (end - start)
                 filtered_matches.append(match)
         return filtered_matches
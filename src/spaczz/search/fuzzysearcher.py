@@ -1,11 +1,22 @@
 """Module for FuzzySearcher: fuzzy matching in spaCy `Doc` objects."""
-from typing import Any, Union
+from collections import Counter, defaultdict
+from typing import Any, DefaultDict, Dict, List, Optional, Set, Tuple, Union
 
+import numpy as np
 from spacy.tokens import Doc, Span, Token
 from spacy.vocab import Vocab
 
 from . import _PhraseSearcher
-from ..process import FuzzyFuncs
+from ._phrasesearcher import WindowScorer
+from ..process import (
+    cutoff_ratio,
+    doc_cache,
+    FuzzyFuncs,
+    max_indel_distance,
+    myers_search,
+    score_cutoff,
+    score_matrix,
+)
 
 
 class FuzzySearcher(_PhraseSearcher):
@@ -59,6 +70,7 @@ class FuzzySearcher(_PhraseSearcher):
         b: Union[Doc, Span, Token],
         ignore_case: bool = True,
         fuzzy_func: str = "simple",
+        min_r: int = 0,
         *args: Any,
         **kwargs: Any,
     ) -> int:
@@ -68,6 +80,9 @@ class FuzzySearcher(_PhraseSearcher):
         to two spacy containers (`Doc`, `Span`, `Token`)
         and returns the resulting fuzzy ratio.
 
+        min_r is passed to the fuzzy matching function as a score cutoff
+        so it can stop early when the ratio cannot reach it.
+
         Args:
             a: First container for comparison.
             b: Second container for comparison.
@@ -86,11 +101,13 @@ class FuzzySearcher(_PhraseSearcher):
                 "weighted" = `WRatio`
                 "quick_lev" = `quick_lev_ratio`
                 Default is `"simple"`.
+            min_r: Minimum fuzzy ratio to return.
+                Ratios below min_r are returned as 0. Default is `0`.
             *args: Overflow for child positional arguments.
             **kwargs: Overflow for child keyword arguments.
 
         Returns:
-            The fuzzy ratio between a and b.
+            The fuzzy ratio between a and b, or 0 if it is below min_r.
 
         Example:
             >>> import spacy
@@ -106,4 +123,476 @@ class FuzzySearcher(_PhraseSearcher):
         else:
             a_text = a.text
             b_text = b.text
-        return round(self._fuzzy_funcs.get(fuzzy_func)(a_text, b_text))
+        return cutoff_ratio(self._fuzzy_funcs.get(fuzzy_func), a_text, b_text, min_r)
+
+    def match(
+        self,
+        doc: Doc,
+        query: Doc,
+        flex: Union[str, int] = "default",
+        min_r1: int = 50,
+        min_r2: int = 75,
+        *args: Any,
+        cluster: bool = False,
+        top_k: Optional[int] = None,
+        backend: str = "window",
+        **kwargs: Any,
+    ) -> List[Tuple[int, int, int]]:
+        """Returns fuzzy phrase matches in a `Doc` object.
+
+        See `_PhraseSearcher.match()` for details on the "window" backend.
+
+        The "myers" backend instead runs a bit-parallel approximate
+        string search of the query over the doc text, which finds every
+        token span within the Levenshtein distance the min_r2 ratio allows,
+        whatever its length. These spans are scored with the "simple" ratio,
+        so flex, min_r1 and cluster do not apply.
+
+        Args:
+            doc: `Doc` object to search over.
+            query: `Doc` object to match against doc.
+            flex: Number of tokens to move match span boundaries
+                left and right during match optimization.
+                Default is `"default"`.
+            min_r1: Minimum match ratio required for
+                selection during the intial search over doc.
+                Default is `50`.
+            min_r2: Minimum match ratio required for
+                selection during match optimization. Default is `75`.
+            *args: Overflow for child positional arguments.
+            cluster: Whether to only optimize the best of each group
+                of overlapping initial matches. Default is `False`.
+            top_k: If set, only the first top_k matches are returned.
+                Default is `None`.
+            backend: How doc is searched, `"window"` (scan query length
+                windows then flex their boundaries) or `"myers"`
+                (approximate string search, "simple" fuzzy_func only).
+                Default is `"window"`.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of tuples of match span start indices,
+            end indices, and match ratios.
+
+        Raises:
+            TypeError: doc must be a `Doc` object.
+            TypeError: query must be a `Doc` object.
+            ValueError: backend must be "window" or "myers".
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.search import FuzzySearcher
+            >>> nlp = spacy.blank("en")
+            >>> searcher = FuzzySearcher(nlp.vocab)
+            >>> doc = nlp("Ridley Scott was the director of Alien.")
+            >>> searcher.match(doc, nlp("Ridly Scot"), backend="myers")
+            [(0, 2, 91)]
+        """
+        if backend == "window":
+            return super().match(
+                doc,
+                query,
+                flex,
+                min_r1,
+                min_r2,
+                *args,
+                cluster=cluster,
+                top_k=top_k,
+                **kwargs,
+            )
+        if backend != "myers":
+            raise ValueError(f"backend must be 'window' or 'myers', not {backend}.")
+        if not isinstance(doc, Doc):
+            raise TypeError("doc must be a Doc object.")
+        if not isinstance(query, Doc):
+            raise TypeError("query must be a Doc object.")
+        return self._match_myers(doc, query, min_r2, *args, top_k=top_k, **kwargs)
+
+    def match_many(
+        self,
+        doc: Doc,
+        queries: List[Doc],
+        kwargs: List[Dict[str, Any]],
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+    ) -> List[List[Tuple[int, int, int]]]:
+        """Returns fuzzy phrase matches in a `Doc` object for several queries.
+
+        Queries using the "window" backend are scanned together,
+        see `_PhraseSearcher.match_many()`. Queries using the "myers"
+        backend are searched one at a time and ignore candidates.
+
+        Args:
+            doc: `Doc` object to search over.
+            queries: `Doc` objects to match against doc.
+            kwargs: One dictionary of `match()` keyword arguments per query.
+            candidates: Optional start indices of the `len(query)` windows
+                each "window" backend query's initial search
+                should be limited to. Default is `None`.
+
+        Returns:
+            A list of `match()` results, one for each query.
+        """
+        results: List[List[Tuple[int, int, int]]] = [[] for _ in queries]
+        window_indices = []
+        for i, query_kwargs in enumerate(kwargs):
+            if query_kwargs.get("backend", "window") == "window":
+                window_indices.append(i)
+            else:
+                results[i] = self.match(doc, queries[i], **query_kwargs)
+        window_results = super().match_many(
+            doc,
+            [queries[i] for i in window_indices],
+            [
+                {key: value for key, value in kwargs[i].items() if key != "backend"}
+                for i in window_indices
+            ],
+            [candidates[i] for i in window_indices] if candidates else None,
+        )
+        for i, matches in zip(window_indices, window_results):
+            results[i] = matches
+        return results
+
+    def _match_myers(
+        self,
+        doc: Doc,
+        query: Doc,
+        min_r2: int = 75,
+        ignore_case: bool = True,
+        fuzzy_func: str = "simple",
+        *args: Any,
+        top_k: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[int, int, int]]:
+        """Finds matches with a bit-parallel approximate string search.
+
+        A span reaching min_r2 is within `max_indel_distance()`
+        Levenshtein edits of the query.
+        A forward search keeps the token ends some substring within that
+        distance ends at. From each one, an anchored search of the reversed
+        query over the reversed text finds the token starts of spans
+        ending there within the distance. Only those spans are scored.
+
+        Args:
+            doc: `Doc` object to search over.
+            query: `Doc` object to match against doc.
+            min_r2: Minimum match ratio required. Default is `75`.
+            ignore_case: Whether to lower-case text before comparison or not.
+                Default is `True`.
+            fuzzy_func: Key name of fuzzy matching function to use.
+                Must be `"simple"`.
+            *args: Overflow for child positional arguments.
+            top_k: If set, only the first top_k matches are returned.
+                Default is `None`.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of tuples of match span start indices,
+            end indices, and match ratios.
+
+        Raises:
+            ValueError: fuzzy_func must be "simple".
+        """
+        if fuzzy_func != "simple":
+            raise ValueError(
+                f"The myers backend only supports the 'simple' fuzzy_func,"
+                f" not {fuzzy_func}."
+            )
+        if not len(query) or not len(doc):
+            return []
+        text, starts, ends, fold_windows = self._prepare_text(doc, ignore_case)
+        if fold_windows:
+            # Folds case without changing the length so offsets stay aligned.
+            text = "".join(
+                char.lower() if len(char.lower()) == 1 else char for char in text
+            )
+        query_text = query.text.lower() if ignore_case else query.text
+        max_edits = max_indel_distance(len(query_text), min_r2)
+        if max_edits is None:
+            max_edits = len(text)
+        start_tokens = {start: i for i, start in enumerate(starts)}
+        end_tokens = {end: i for i, end in enumerate(ends)}
+        reversed_query = query_text[::-1]
+        scorer = self._window_scorer(doc, query, ignore_case, fuzzy_func)
+        matches = []
+        for end, _ in myers_search(query_text, text, max_edits):
+            end_token = end_tokens.get(end)
+            if end_token is None:
+                continue
+            lo = max(end - len(query_text) - max_edits, 0)
+            for offset, _ in myers_search(
+                reversed_query, text[lo:end][::-1], max_edits, anchored=True
+            ):
+                start_token = start_tokens.get(end - offset)
+                if start_token is not None and start_token <= end_token:
+                    ratio = scorer(start_token, end_token + 1, min_r2)
+                    if ratio:
+                        matches.append((start_token, end_token + 1, ratio))
+        matches.sort(key=lambda x: (-x[2], x[0]))
+        return self._filter_overlapping_matches(matches)[:top_k]
+
+    def _window_scorer(
+        self,
+        doc: Doc,
+        query: Doc,
+        ignore_case: bool = True,
+        fuzzy_func: str = "simple",
+        *args: Any,
+        **kwargs: Any,
+    ) -> WindowScorer:
+        """Returns a function that fuzzy matches `doc[start:end]` against query.
+
+        The doc text is case-folded once and mapped to token offsets
+        so each window is scored by slicing the precomputed text
+        instead of building a `Span` and lower-casing it again.
+        For fuzzy matching functions with a length based ratio bound,
+        windows whose length rules out reaching the minimum ratio
+        are skipped without being scored.
+        Scores are identical to `compare()`.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            ignore_case: Whether to lower-case text before comparison or not.
+                Default is `True`.
+            fuzzy_func: Key name of fuzzy matching function to use.
+                Default is `"simple"`.
+            *args: Overflow for child positional arguments.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A function taking a window start index, end index
+            and minimum ratio and returning the window's fuzzy ratio.
+        """
+        func = self._fuzzy_funcs.get(fuzzy_func)
+        length_bound = self._fuzzy_funcs.get_length_bound(fuzzy_func)
+        text, starts, ends, fold_windows = self._prepare_text(doc, ignore_case)
+        query_text = query.text.lower() if ignore_case else query.text
+        if length_bound is not None:
+            query_len = length_bound.len(query_text)
+            # Token offsets give window lengths without slicing
+            # unless the scorer or case-folding changes them.
+            offset_lens = length_bound.processor is None and not fold_windows
+
+        def scorer(start: int, end: int, min_r: int = 0) -> int:
+            if end > start:
+                if (
+                    length_bound is not None
+                    and offset_lens
+                    and length_bound.rules_out(
+                        query_len, ends[end - 1] - starts[start], min_r
+                    )
+                ):
+                    return 0
+                window = text[starts[start] : ends[end - 1]]
+            else:
+                window = ""
+            if fold_windows:
+                window = window.lower()
+            if (
+                length_bound is not None
+                and not offset_lens
+                and length_bound.rules_out(query_len, length_bound.len(window), min_r)
+            ):
+                return 0
+            return cutoff_ratio(func, query_text, window, min_r)
+
+        return scorer
+
+    def _scan_many(
+        self,
+        doc: Doc,
+        queries: List[Doc],
+        min_r1s: List[int],
+        ignore_case: bool = True,
+        fuzzy_func: str = "simple",
+        *args: Any,
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+        **kwargs: Any,
+    ) -> List[Union[Dict[int, int], None]]:
+        """Returns `_scan()` results for several queries in one batch.
+
+        Queries are grouped by token length, the doc windows for each
+        length are built once, and the full (queries x windows) score
+        matrix is computed in a single scorer call.
+        Queries with candidate start indices only score those windows.
+
+        Args:
+            doc: `Doc` object to search over.
+            queries: `Doc` objects to match against doc.
+            min_r1s: Minimum match ratio for each query.
+            ignore_case: Whether to lower-case text before comparison or not.
+                Default is `True`.
+            fuzzy_func: Key name of fuzzy matching function to use.
+                Default is `"simple"`.
+            *args: Overflow for child positional arguments.
+            candidates: Optional window start indices to restrict
+                each query's scan to. `None` scans every window.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of `_scan()` results, one for each query.
+        """
+        func = self._fuzzy_funcs.get(fuzzy_func)
+        length_bound = self._fuzzy_funcs.get_length_bound(fuzzy_func)
+        by_len: DefaultDict[int, List[int]] = defaultdict(list)
+        for i, query in enumerate(queries):
+            if 0 < len(query) <= len(doc):
+                by_len[len(query)].append(i)
+        all_match_values: List[Union[Dict[int, int], None]] = [None for _ in queries]
+        for n, indices in by_len.items():
+            windows = self._windows(doc, n, ignore_case)
+            query_texts = {
+                i: queries[i].text.lower() if ignore_case else queries[i].text
+                for i in indices
+            }
+            full_scan = [i for i in indices if not candidates or candidates[i] is None]
+            if full_scan:
+                scores = score_matrix(
+                    [query_texts[i] for i in full_scan],
+                    windows,
+                    func,
+                    score_cutoff(min(min_r1s[i] for i in full_scan)),
+                    length_bound,
+                )
+                for i, row in zip(full_scan, scores):
+                    positions = (row >= min_r1s[i]).nonzero()[0]
+                    if len(positions):
+                        all_match_values[i] = {
+                            int(pos): int(row[pos]) for pos in positions
+                        }
+            if candidates:
+                for i in indices:
+                    positions = candidates[i]
+                    if positions is None:
+                        continue
+                    match_values = {}
+                    for pos in sorted(positions):
+                        if length_bound is not None and length_bound.rules_out(
+                            length_bound.len(query_texts[i]),
+                            length_bound.len(windows[pos]),
+                            min_r1s[i],
+                        ):
+                            continue
+                        ratio = cutoff_ratio(
+                            func, query_texts[i], windows[pos], min_r1s[i]
+                        )
+                        if ratio >= min_r1s[i]:
+                            match_values[pos] = ratio
+                    all_match_values[i] = match_values or None
+        return all_match_values
+
+    def _optimize_bounds(
+        self,
+        doc: Doc,
+        query: Doc,
+        positions: List[int],
+        flex: int,
+        ignore_case: bool = True,
+        fuzzy_func: str = "simple",
+        *args: Any,
+        **kwargs: Any,
+    ) -> Optional[Dict[int, float]]:
+        """Returns upper bounds on the optimized ratio of potential matches.
+
+        Any span an optimization of the match at `pos` can return lies within
+        `doc[pos - flex : pos + len(query) + flex]`. For the `"simple"` ratio,
+        a span sharing at most `c` characters (as a multiset) with the query
+        scores at most `200 * c / (len(query) + c)`, so the characters
+        shared by the query and that region bound every such span.
+        Character counts come from prefix sums over the doc text,
+        one per distinct query character.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            positions: Start indices of the initial matches.
+            flex: Number of tokens match span boundaries may move.
+            ignore_case: Whether to lower-case text before comparison or not.
+                Default is `True`.
+            fuzzy_func: Key name of fuzzy matching function to use.
+                Default is `"simple"`.
+            *args: Overflow for child positional arguments.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A dictionary of start index, unrounded ratio bound pairs,
+            or `None` for other fuzzy functions.
+        """
+        if fuzzy_func != "simple" or not positions:
+            return None
+        text, starts, ends, fold_windows = self._prepare_text(doc, ignore_case)
+        if fold_windows:
+            return None
+        query_text = query.text.lower() if ignore_case else query.text
+        codes = doc_cache(doc).memo(
+            ("codes", ignore_case),
+            lambda: np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32),
+        )
+        pos_array = np.array(positions)
+        lo = np.array(starts)[np.maximum(pos_array - flex, 0)]
+        hi = np.array(ends)[np.minimum(pos_array + len(query) + flex, len(doc)) - 1]
+        common = np.zeros(len(positions))
+        for char, count in Counter(query_text).items():
+            prefix = np.concatenate(([0], np.cumsum(codes == ord(char))))
+            common += np.minimum(prefix[hi] - prefix[lo], count)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bounds = np.where(
+                common > 0, 200 * common / (len(query_text) + common), 0.0
+            )
+        return {pos: float(bound) for pos, bound in zip(positions, bounds)}
+
+    def _windows(self, doc: Doc, n: int, ignore_case: bool) -> List[str]:
+        """Returns the (possibly lower-cased) text of every n token doc window.
+
+        Windows are kept in the doc's `DocCache`, so queries of the same
+        length share them across calls on the same doc.
+
+        Args:
+            doc: `Doc` object being searched over.
+            n: Number of tokens per window.
+            ignore_case: Whether to lower-case the windows or not.
+
+        Returns:
+            The window texts, indexed by start token.
+        """
+
+        def build() -> List[str]:
+            text, starts, ends, fold_windows = self._prepare_text(doc, ignore_case)
+            windows = [
+                text[starts[i] : ends[i + n - 1]] for i in range(len(doc) - n + 1)
+            ]
+            if fold_windows:
+                windows = [window.lower() for window in windows]
+            return windows
+
+        return doc_cache(doc).memo(("windows", n, ignore_case), build)
+
+    @staticmethod
+    def _prepare_text(
+        doc: Doc, ignore_case: bool
+    ) -> Tuple[str, List[int], List[int], bool]:
+        """Returns doc text, token offsets, and whether windows need case-folding.
+
+        If lower-casing changes the text length (e.g. dotted capital I)
+        the original text is returned and windows must be lower-cased
+        individually to keep the token offsets aligned.
+        Text and offsets come from the doc's shared `DocCache`.
+
+        Args:
+            doc: `Doc` object being searched over.
+            ignore_case: Whether to lower-case the text or not.
+
+        Returns:
+            The (possibly lower-cased) doc text, token start offsets,
+            token end offsets, and whether windows need lower-casing.
+        """
+        cache = doc_cache(doc)
+        text = cache.text
+        fold_windows = False
+        if ignore_case:
+            lowered = cache.lower
+            if len(lowered) == len(text):
+                text = lowered
+            else:
+                fold_windows = True
+        return text, cache.starts, cache.ends, fold_windows
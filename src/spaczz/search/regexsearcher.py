@@ -4,7 +4,7 @@ from typing import List, Tuple, Union
 from spacy.tokens import Doc, Span
 from spacy.vocab import Vocab
 
-from ..process import map_chars_to_tokens
+from ..process import doc_cache
 from ..regex import RegexConfig
 
 
@@ -119,8 +119,8 @@ class RegexSearcher:
         else:
             raise TypeError(f"query must be a str, not {type(query)}.")
         matches = []
-        chars_to_tokens = map_chars_to_tokens(doc)
-        for match in compiled_regex.finditer(doc.text):
+        chars_to_tokens = doc_cache(doc).chars_to_tokens
+        for match in compiled_regex.finditer(doc.text, concurrent=True):
             start, end = match.span()
             counts = match.fuzzy_counts
             span = doc.char_span(start, end)
@@ -1,12 +1,17 @@
 """Module for SimilaritySearcher: vector similarity matching in spaCy `Doc` objects."""
-from typing import Any, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 import warnings
+from weakref import WeakKeyDictionary
 
+import numpy as np
+from spacy.attrs import ORTH
 from spacy.tokens import Doc, Span, Token
 from spacy.vocab import Vocab
 
 from . import _PhraseSearcher
+from ._phrasesearcher import WindowScorer
 from ..exceptions import MissingVectorsWarning
+from ..process import doc_cache
 
 
 class SimilaritySearcher(_PhraseSearcher):
@@ -32,6 +37,12 @@ class SimilaritySearcher(_PhraseSearcher):
     Attributes:
         vocab (Vocab): The shared vocabulary.
             Included for consistency and potential future-state.
+        _query_refs (WeakKeyDictionary[Doc, int]): Number of times
+            each query is registered, e.g. by several matcher labels.
+        _query_rows (WeakKeyDictionary[Doc, int]): Row of each query
+            registered with `add_queries()` in `_query_vectors`.
+        _query_vectors (np.ndarray): Normalized float32 vectors
+            of registered queries, one row per query.
     """
 
     def __init__(self, vocab: Vocab) -> None:
@@ -50,6 +61,9 @@ class SimilaritySearcher(_PhraseSearcher):
                 If vocab does not contain any word vectors.
         """
         super().__init__(vocab=vocab)
+        self._query_refs: WeakKeyDictionary[Doc, int] = WeakKeyDictionary()
+        self._query_rows: WeakKeyDictionary[Doc, int] = WeakKeyDictionary()
+        self._query_vectors = np.zeros((0, vocab.vectors_length), dtype="float32")
         if vocab.vectors.n_keys == 0:
             warnings.warn(
                 """The spaCy Vocab object has no word vectors.\n
@@ -94,3 +108,233 @@ class SimilaritySearcher(_PhraseSearcher):
                 return round(a.similarity(b) * 100)
             else:
                 return 0
+
+    def add_queries(self, queries: Iterable[Doc]) -> None:
+        """Precomputes normalized vectors for queries that will be searched for.
+
+        Batched scans look registered queries' vectors up
+        instead of recomputing them for every doc.
+
+        Queries are reference counted, so a query registered twice
+        keeps its row until it is removed twice.
+
+        Args:
+            queries: `Doc` objects to register.
+        """
+        new_queries: List[Doc] = []
+        for query in queries:
+            refs = self._query_refs.get(query, 0)
+            if not refs:
+                new_queries.append(query)
+            self._query_refs[query] = refs + 1
+        if not new_queries:
+            return
+        for row, query in enumerate(new_queries, start=len(self._query_vectors)):
+            self._query_rows[query] = row
+        self._query_vectors = np.vstack(
+            [self._query_vectors, self._unit_vectors(new_queries)]
+        )
+
+    def remove_queries(self, queries: Iterable[Doc]) -> None:
+        """Drops queries registered with `add_queries()`.
+
+        A query's row is only dropped once it has been removed
+        as many times as it was added.
+
+        Args:
+            queries: `Doc` objects to unregister.
+        """
+        dropped = False
+        for query in queries:
+            refs = self._query_refs.get(query, 0) - 1
+            if refs > 0:
+                self._query_refs[query] = refs
+            elif query in self._query_refs:
+                del self._query_refs[query]
+                del self._query_rows[query]
+                dropped = True
+        if not dropped:
+            return
+        rows = sorted(self._query_rows.items(), key=lambda item: item[1])
+        self._query_vectors = self._query_vectors[[row for _, row in rows]]
+        for new_row, (query, _) in enumerate(rows):
+            self._query_rows[query] = new_row
+
+    def _window_scorer(
+        self, doc: Doc, query: Doc, *args: Any, **kwargs: Any
+    ) -> WindowScorer:
+        """Returns a function that scores `doc[start:end]` against query.
+
+        The doc's token vectors are summed cumulatively once, so each window's
+        vector is the difference of two rows, and no `Span` objects
+        are built while scoring.
+        Falls back to `compare()` if doc or query has custom vector hooks.
+
+        Args:
+            doc: `Doc` object being searched over.
+            query: `Doc` object to match against doc.
+            *args: Overflow for child positional arguments.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A function taking a window start index, end index
+            and minimum ratio and returning the window's match ratio.
+        """
+        sums = self._vector_sums(doc, query)
+        if sums is None:
+            return super()._window_scorer(doc, query, *args, **kwargs)
+        orths = [token.orth for token in doc]
+        query_orths = [token.orth for token in query]
+        query_norm = float(query.vector_norm)
+        # Cosine similarity ignores scale, so window sums stand in for means.
+        dots = sums @ query.vector.astype("float64")
+
+        def scorer(start: int, end: int, min_r: int = 0) -> int:
+            if not query_norm or end <= start:
+                return 0
+            vector = sums[end] - sums[start]
+            norm = np.sqrt(vector @ vector)
+            if not norm:
+                return 0
+            if orths[start:end] == query_orths:
+                ratio = 100
+            else:
+                ratio = round((dots[end] - dots[start]) / (norm * query_norm) * 100)
+            return ratio
+
+        return scorer
+
+    def _scan_many(
+        self,
+        doc: Doc,
+        queries: List[Doc],
+        min_r1s: List[int],
+        *args: Any,
+        candidates: Optional[List[Optional[Set[int]]]] = None,
+        **kwargs: Any,
+    ) -> List[Union[Dict[int, int], None]]:
+        """Returns `_scan()` results for several queries in one batch.
+
+        Queries are grouped by token length and the vectors
+        of all doc windows of each length are computed at once from
+        cumulative sums of the doc's token vectors. Every window is then
+        scored against every query with one matrix product,
+        using the precomputed vectors of queries from `add_queries()`.
+
+        Args:
+            doc: `Doc` object to search over.
+            queries: `Doc` objects to match against doc.
+            min_r1s: Minimum match ratio for each query.
+            *args: Overflow for child positional arguments.
+            candidates: Optional window start indices to restrict
+                each query's scan to. `None` scans every window.
+            **kwargs: Overflow for child keyword arguments.
+
+        Returns:
+            A list of `_scan()` results, one for each query.
+        """
+        sums = self._vector_sums(doc, *queries)
+        if sums is None:
+            return super()._scan_many(
+                doc, queries, min_r1s, *args, candidates=candidates, **kwargs
+            )
+        orths = doc.to_array(ORTH)
+        by_len: Dict[int, List[int]] = {}
+        for i, query in enumerate(queries):
+            if 0 < len(query) <= len(doc):
+                by_len.setdefault(len(query), []).append(i)
+        all_match_values: List[Union[Dict[int, int], None]] = [None for _ in queries]
+        for n, indices in by_len.items():
+            windows = sums[n:] - sums[:-n]
+            window_norms = np.sqrt((windows * windows).sum(axis=1))
+            query_vectors = self._query_matrix([queries[i] for i in indices])
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = (windows @ query_vectors.T) / window_norms[:, None]
+            scores = np.where(np.isfinite(scores), np.rint(scores * 100), 0)
+            scores[window_norms == 0, :] = 0
+            for col, i in enumerate(indices):
+                if query_vectors[col].any():
+                    for pos in self._orth_matches(orths, queries[i].to_array(ORTH)):
+                        if window_norms[pos]:
+                            scores[pos, col] = 100
+                positions = (scores[:, col] >= min_r1s[i]).nonzero()[0].tolist()
+                query_candidates = candidates[i] if candidates else None
+                if query_candidates is not None:
+                    positions = [pos for pos in positions if pos in query_candidates]
+                if positions:
+                    all_match_values[i] = {
+                        pos: int(scores[pos, col]) for pos in positions
+                    }
+        return all_match_values
+
+    def _vector_sums(self, doc: Doc, *queries: Doc) -> Optional[np.ndarray]:
+        """Returns cumulative sums of the doc's token vectors.
+
+        Row `i` holds the sum of the first `i` token vectors,
+        so the sum over `doc[start:end]` is `sums[end] - sums[start]`.
+        The sums are kept in the doc's `DocCache` for every query
+        and matcher that searches it.
+
+        Args:
+            doc: `Doc` object being searched over.
+            *queries: `Doc` objects that will be compared to doc windows.
+
+        Returns:
+            A (len(doc) + 1, vector width) array, or `None` if the vocab
+            has no word vectors or if doc or any query overrides
+            vectors or similarity with user hooks.
+        """
+        if not doc.vocab.vectors.size:
+            return None
+        if doc.user_hooks or doc.user_span_hooks or doc.user_token_hooks:
+            return None
+        if any(query.user_hooks for query in queries):
+            return None
+
+        def build() -> np.ndarray:
+            sums = np.zeros((len(doc) + 1, doc.vocab.vectors_length), dtype="float64")
+            if len(doc):
+                orths = doc.to_array(ORTH)
+                unique_orths, inverse = np.unique(orths, return_inverse=True)
+                vectors = np.array(
+                    [doc.vocab.get_vector(orth) for orth in unique_orths]
+                )
+                np.cumsum(vectors[inverse], axis=0, out=sums[1:])
+            return sums
+
+        return doc_cache(doc).memo("vector_sums", build)
+
+    def _query_matrix(self, queries: List[Doc]) -> np.ndarray:
+        """Returns the queries' normalized vectors as rows.
+
+        Rows of queries registered with `add_queries()` are gathered
+        from `_query_vectors`, otherwise all vectors are computed.
+
+        Args:
+            queries: `Doc` objects to get vectors for.
+
+        Returns:
+            A (len(queries), vector width) float32 array.
+        """
+        rows = [self._query_rows.get(query) for query in queries]
+        found = [row for row in rows if row is not None]
+        if len(found) < len(rows):
+            return self._unit_vectors(queries)
+        return self._query_vectors[found]
+
+    @staticmethod
+    def _unit_vectors(queries: List[Doc]) -> np.ndarray:
+        """Returns the queries' vectors scaled to unit length as float32 rows."""
+        vectors = np.array([query.vector for query in queries], dtype="float32")
+        norms = np.sqrt((vectors * vectors).sum(axis=1, keepdims=True))
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+    @staticmethod
+    def _orth_matches(orths: np.ndarray, query_orths: np.ndarray) -> List[int]:
+        """Returns start indices of windows with exactly the query's tokens."""
+        n = len(query_orths)
+        return [
+            int(pos)
+            for pos in (orths[: len(orths) - n + 1] == query_orths[0]).nonzero()[0]
+            if (orths[pos : pos + n] == query_orths).all()
+        ]
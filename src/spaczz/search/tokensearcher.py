@@ -1,11 +1,71 @@
 """Module for TokenSearcher: flexible token searching in spaCy `Doc` objects."""
-from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import regex
 from spacy.tokens import Doc, Token
 from spacy.vocab import Vocab
 
-from ..process import FuzzyFuncs, n_wise
+from ..process import cutoff_ratio, FuzzyFuncs, LengthBound, n_wise
+
+
+class TokenPredicate(NamedTuple):
+    """A FUZZY or FREGEX pattern token with its settings resolved.
+
+    Attributes:
+        ignore_case: Whether the token was a "LOWER" (`True`)
+            or "TEXT" (`False`) pattern.
+        kind: `"FUZZY"` or `"FREGEX"`.
+        text: The FUZZY text or FREGEX pattern string.
+        min_r: Minimum match ratio of FUZZY tokens, `None` for FREGEX.
+        fuzzy_func: Fuzzy matching function of FUZZY tokens, `None` for FREGEX.
+    """
+
+    ignore_case: bool
+    kind: str
+    text: str
+    min_r: Optional[int]
+    fuzzy_func: Optional[str]
+
+    @property
+    def case(self) -> str:
+        """The pattern key the token was under."""
+        return "LOWER" if self.ignore_case else "TEXT"
+
+
+def _regex_predicate(pattern: regex.Pattern, ignore_case: bool, text: str) -> bool:
+    """Whether text matches a compiled FREGEX pattern."""
+    return bool(pattern.match(text.lower() if ignore_case else text))
+
+
+def _fuzzy_predicate(
+    func: Callable[..., float],
+    length_bound: Optional[LengthBound],
+    pattern_text: str,
+    pattern_len: int,
+    min_r: int,
+    ignore_case: bool,
+    text: str,
+) -> bool:
+    """Whether text fuzzy matches pattern_text with a ratio of at least min_r."""
+    if ignore_case:
+        text = text.lower()
+    if length_bound is not None and length_bound.rules_out(
+        length_bound.len(text), pattern_len, min_r
+    ):
+        return False
+    return cutoff_ratio(func, text, pattern_text, min_r) >= min_r
 
 
 class TokenSearcher:
@@ -51,13 +111,22 @@ class TokenSearcher:
         self._fuzzy_funcs: FuzzyFuncs = FuzzyFuncs(match_type="token")
 
     def fuzzy_compare(
-        self, a: str, b: str, ignore_case: bool = True, fuzzy_func: str = "simple",
+        self,
+        a: str,
+        b: str,
+        ignore_case: bool = True,
+        fuzzy_func: str = "simple",
+        min_r: int = 0,
     ) -> int:
         """Peforms fuzzy matching between two strings.
 
         Applies the given fuzzy matching algorithm (fuzzy_func)
         to two strings and returns the resulting fuzzy ratio.
 
+        If the strings' lengths alone rule out reaching min_r
+        they are not compared at all, otherwise min_r is passed
+        to the fuzzy matching function as a score cutoff.
+
         Args:
             a: First string for comparison.
             b: Second string for comparison.
@@ -70,9 +139,11 @@ class TokenSearcher:
                 "quick" = `QRatio`
                 "quick_lev" = `quick_lev_ratio`
                 Default is `"simple"`.
+            min_r: Minimum fuzzy ratio to return.
+                Ratios below min_r are returned as 0. Default is `0`.
 
         Returns:
-            The fuzzy ratio between a and b.
+            The fuzzy ratio between a and b, or 0 if it is below min_r.
 
         Example:
             >>> import spacy
@@ -85,7 +156,13 @@ class TokenSearcher:
         if ignore_case:
             a = a.lower()
             b = b.lower()
-        return round(self._fuzzy_funcs.get(fuzzy_func)(a, b))
+        func = self._fuzzy_funcs.get(fuzzy_func)
+        length_bound = self._fuzzy_funcs.get_length_bound(fuzzy_func)
+        if length_bound is not None and length_bound.rules_out(
+            length_bound.len(a), length_bound.len(b), min_r
+        ):
+            return 0
+        return cutoff_ratio(func, a, b, min_r)
 
     def match(
         self,
@@ -93,11 +170,19 @@ class TokenSearcher:
         pattern: List[Dict[str, Any]],
         min_r: int = 75,
         fuzzy_func: str = "simple",
+        term_candidates: Optional[Dict[Tuple[bool, str], Set[str]]] = None,
     ) -> List[List[Optional[Tuple[str, str]]]]:
         """Finds potential token pattern matches in a `Doc` object.
 
         Make sure to use uppercase dictionary keys in patterns.
 
+        Only windows where the pattern's anchor token matches
+        are evaluated, see `anchor_index()`. Repeated matches are
+        returned once, in the order they were first found.
+
+        This only applies to direct `TokenSearcher` use, `TokenMatcher`
+        finds its matches with a compiled spaCy `Matcher` instead.
+
         Args:
             doc: `Doc` object to search over.
             pattern: Individual spaCy token pattern.
@@ -107,6 +192,12 @@ class TokenSearcher:
             fuzzy_func: Fuzzy matching function to use.
                 Can be overwritten with token pattern options.
                 Default is `simple`.
+            term_candidates: Optional mapping from (ignore_case, FUZZY text)
+                pairs of pattern tokens to the doc token texts
+                that may match them, e.g. from a metric index.
+                Pattern tokens in it matched with the "simple" fuzzy_func
+                are only compared with those texts.
+                Default is `None`.
 
         Returns:
             A list of lists with each inner list representing a potential match.
@@ -140,26 +231,175 @@ class TokenSearcher:
             )
         if len(pattern) == 0:
             raise ValueError("pattern cannot have zero tokens.")
-        matches = []
-        for seq in n_wise(doc, len(pattern)):
-            seq_matches = self._iter_pattern(seq, pattern, min_r, fuzzy_func)
-            if seq_matches:
-                matches.append(seq_matches)
-        if matches:
-            filtered_matches = [
-                i for n, i in enumerate(matches) if i not in matches[:n]
-            ]
-            return filtered_matches
+        predicates = self.compile_pattern(pattern, min_r, fuzzy_func)
+        predicate_funcs = {
+            predicate: self.predicate_func(predicate)
+            for predicate in predicates
+            if predicate is not None
+        }
+        anchor = self.anchor_index(predicates)
+        if anchor is None:
+            seqs: Iterable[Tuple[Token, ...]] = n_wise(doc, len(pattern))
         else:
-            return matches
+            tokens = list(doc)
+            seqs = (
+                tuple(tokens[start : start + len(pattern)])
+                for start in self._anchor_starts(
+                    doc,
+                    len(pattern),
+                    anchor,
+                    predicates[anchor],
+                    predicate_funcs,
+                    term_candidates,
+                )
+            )
+        matches: Dict[
+            Tuple[Optional[Tuple[str, str]], ...], List[Optional[Tuple[str, str]]]
+        ] = {}
+        for seq in seqs:
+            seq_matches = self._iter_pattern(
+                seq, predicates, predicate_funcs, term_candidates
+            )
+            if seq_matches:
+                matches.setdefault(tuple(seq_matches), seq_matches)
+        return list(matches.values())
+
+    def compile_pattern(
+        self,
+        pattern: List[Dict[str, Any]],
+        min_r: int = 75,
+        fuzzy_func: str = "simple",
+    ) -> List[Optional[TokenPredicate]]:
+        """Parses the FUZZY and FREGEX tokens of a pattern into predicates.
+
+        Args:
+            pattern: Individual spaCy token pattern.
+            min_r: Minimum match ratio of FUZZY tokens without a MIN_R.
+                Default is `75`.
+            fuzzy_func: Fuzzy matching function of FUZZY tokens
+                without a FUZZY_FUNC. Default is `simple`.
+
+        Returns:
+            A `TokenPredicate` for each FUZZY or FREGEX token
+            and `None` for other tokens.
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.search import TokenSearcher
+            >>> nlp = spacy.blank("en")
+            >>> searcher = TokenSearcher(nlp.vocab)
+            >>> pattern = [{"LOWER": {"FUZZY": "sql", "MIN_R": 85}}, {"IS_DIGIT": True}]
+            >>> predicates = searcher.compile_pattern(pattern)
+            >>> predicates[0].min_r, predicates[1]
+            (85, None)
+        """
+        predicates: List[Optional[TokenPredicate]] = []
+        for token in pattern:
+            pattern_dict, _, case_bool = self._parse_case(token)
+            if not isinstance(pattern_dict, dict):
+                predicates.append(None)
+                continue
+            pattern_text, pattern_type = self._parse_type(pattern_dict)
+            if not pattern_text:
+                predicates.append(None)
+            elif pattern_type == "FUZZY":
+                predicates.append(
+                    TokenPredicate(
+                        case_bool,
+                        pattern_type,
+                        pattern_text,
+                        pattern_dict.get("MIN_R", min_r),
+                        pattern_dict.get("FUZZY_FUNC", fuzzy_func),
+                    )
+                )
+            else:
+                predicates.append(
+                    TokenPredicate(case_bool, pattern_type, pattern_text, None, None)
+                )
+        return predicates
+
+    @staticmethod
+    def anchor_index(predicates: List[Optional[TokenPredicate]]) -> Optional[int]:
+        """Picks the pattern token expected to match the fewest doc tokens.
+
+        `match()` only evaluates windows where this anchor token matches.
+        FUZZY tokens are preferred over FREGEX tokens, then higher
+        MIN_R values, then longer texts. `match()` does not check exact
+        token attributes, so they cannot anchor here. `TokenMatcher`
+        anchors on exact "TEXT" and "LOWER" tokens instead.
+
+        Args:
+            predicates: Compiled pattern from `compile_pattern()`.
+
+        Returns:
+            The index of the anchor token,
+            or `None` if the pattern has no FUZZY or FREGEX tokens.
+
+        Example:
+            >>> import spacy
+            >>> from spaczz.search import TokenSearcher
+            >>> nlp = spacy.blank("en")
+            >>> searcher = TokenSearcher(nlp.vocab)
+            >>> pattern = [{"TEXT": {"FREGEX": "[a-z]+"}}, {"TEXT": {"FUZZY": "SQL"}}]
+            >>> searcher.anchor_index(searcher.compile_pattern(pattern))
+            1
+        """
+        ranked = [
+            ((predicate.kind == "FUZZY", predicate.min_r or 0, len(predicate.text)), i)
+            for i, predicate in enumerate(predicates)
+            if predicate is not None
+        ]
+        if not ranked:
+            return None
+        return max(ranked, key=lambda rank: rank[0])[1]
+
+    def predicate_func(
+        self, predicate: TokenPredicate, compiled: Optional[regex.Pattern] = None
+    ) -> Callable[[str], bool]:
+        """Returns a function testing whether a token text satisfies a predicate.
+
+        The fuzzy matching function, its length bound and the regex
+        are looked up once, rather than for every token text.
+        Results are the same as `fuzzy_compare()` and `regex_compare()`.
+        The function is a `functools.partial`, so matchers holding it
+        can still be pickled.
+
+        Args:
+            predicate: The `TokenPredicate` to test.
+            compiled: The FREGEX pattern already compiled, if it is.
+                Default is `None`.
+
+        Returns:
+            A function taking a token text and returning
+            whether it satisfies the predicate.
+        """
+        ignore_case = predicate.ignore_case
+        if predicate.kind == "FREGEX":
+            pattern = compiled or regex.compile(predicate.text)
+            return partial(_regex_predicate, pattern, ignore_case)
+        fuzzy_func = predicate.fuzzy_func or "simple"
+        length_bound = self._fuzzy_funcs.get_length_bound(fuzzy_func)
+        pattern_text = predicate.text.lower() if ignore_case else predicate.text
+        return partial(
+            _fuzzy_predicate,
+            self._fuzzy_funcs.get(fuzzy_func),
+            length_bound,
+            pattern_text,
+            length_bound.len(pattern_text) if length_bound is not None else 0,
+            predicate.min_r or 0,
+            ignore_case,
+        )
 
     @staticmethod
-    def regex_compare(text: str, pattern: str, ignore_case: bool = False) -> bool:
+    def regex_compare(
+        text: str, pattern: Union[str, regex.Pattern], ignore_case: bool = False
+    ) -> bool:
         """Performs fuzzy-regex supporting regex matching between two strings.
 
         Args:
             text: The string to match against.
-            pattern: The regex pattern string.
+            pattern: The regex pattern string, or a pattern compiled with
+                `regex.compile()` to skip the regex module's cache lookup.
             ignore_case: Whether to lower-case text
                 before comparison or not. Default is `False`.
 
@@ -176,43 +416,68 @@ class TokenSearcher:
         """
         if ignore_case:
             text = text.lower()
-        if regex.match(pattern, text):
+        if isinstance(pattern, str):
+            pattern = regex.compile(pattern)
+        if pattern.match(text):
             return True
         else:
             return False
 
+    @staticmethod
+    def _anchor_starts(
+        doc: Doc,
+        n: int,
+        anchor: int,
+        predicate: Optional[TokenPredicate],
+        predicate_funcs: Dict[TokenPredicate, Callable[[str], bool]],
+        term_candidates: Optional[Dict[Tuple[bool, str], Set[str]]] = None,
+    ) -> List[int]:
+        """Starts of windows whose anchor matches, testing each text once."""
+        if predicate is None or len(doc) < n:
+            return []
+        positions: Dict[str, List[int]] = {}
+        for i, token in enumerate(doc[anchor : len(doc) - n + anchor + 1], anchor):
+            positions.setdefault(token.text, []).append(i)
+        texts: Iterable[str] = positions
+        if (
+            term_candidates
+            and predicate.kind == "FUZZY"
+            and predicate.fuzzy_func == "simple"
+        ):
+            candidates = term_candidates.get((predicate.ignore_case, predicate.text))
+            if candidates is not None:
+                texts = [text for text in positions if text in candidates]
+        func = predicate_funcs[predicate]
+        return sorted(
+            i - anchor for text in texts if func(text) for i in positions[text]
+        )
+
+    @staticmethod
     def _iter_pattern(
-        self,
         seq: Tuple[Token, ...],
-        pattern: List[Dict[str, Any]],
-        min_r: int,
-        fuzzy_func: str,
+        predicates: List[Optional[TokenPredicate]],
+        predicate_funcs: Dict[TokenPredicate, Callable[[str], bool]],
+        term_candidates: Optional[Dict[Tuple[bool, str], Set[str]]] = None,
     ) -> List[Optional[Tuple[str, str]]]:
-        """Evaluates each token in a pattern against a doc token sequence."""
+        """Evaluates each compiled pattern token against a doc token sequence."""
         seq_matches: List[Optional[Tuple[str, str]]] = []
-        for i, token in enumerate(pattern):
-            pattern_dict, case, case_bool = self._parse_case(token)
-            if isinstance(pattern_dict, dict):
-                pattern_text, pattern_type = self._parse_type(pattern_dict)
-                if pattern_text and pattern_type == "FUZZY":
-                    if self.fuzzy_compare(
-                        seq[i].text,
-                        pattern_text,
-                        case_bool,
-                        pattern_dict.get("FUZZY_FUNC", fuzzy_func),
-                    ) >= pattern_dict.get("MIN_R", min_r):
-                        seq_matches.append((case, seq[i].text))
-                    else:
-                        return []
-                elif pattern_text and pattern_type == "FREGEX":
-                    if self.regex_compare(seq[i].text, pattern_text, case_bool):
-                        seq_matches.append((case, seq[i].text))
-                    else:
-                        return []
-                else:
-                    seq_matches.append(None)
-            else:
+        for token, predicate in zip(seq, predicates):
+            if predicate is None:
                 seq_matches.append(None)
+                continue
+            if (
+                term_candidates
+                and predicate.kind == "FUZZY"
+                and predicate.fuzzy_func == "simple"
+            ):
+                candidates = term_candidates.get(
+                    (predicate.ignore_case, predicate.text)
+                )
+                if candidates is not None and token.text not in candidates:
+                    return []
+            if not predicate_funcs[predicate](token.text):
+                return []
+            seq_matches.append((predicate.case, token.text))
         return seq_matches
 
     @staticmethod
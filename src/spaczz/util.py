@@ -1,6 +1,30 @@
 """Module for various utility functions."""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from math import ceil
+import multiprocessing as mp
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, Union
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from spacy.tokens import Doc
+from spacy.util import minibatch
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# The matcher each pipe() worker process holds, set by _init_pipe_worker().
+_pipe_matcher: Any = None
 
 
 def ensure_path(path: Union[str, Path]) -> Path:
@@ -38,3 +62,109 @@ def read_from_disk(path: Union[str, Path], readers: Any, exclude: Any) -> Path:
         if key.split(".")[0] not in exclude:
             reader(path / key)
     return path
+
+
+def thread_map_chunks(
+    func: Callable[[Sequence[T]], List[R]], items: Sequence[T], n_threads: int = 1
+) -> List[R]:
+    """Applies func to contiguous chunks of items in a thread pool.
+
+    Results are concatenated in the order of items, regardless of
+    which thread finishes first, so they are the same as `func(items)`
+    for any func that handles each item independently.
+
+    Args:
+        func: Function mapping a sequence of items to one result per item.
+        items: Items to split into at most n_threads chunks.
+        n_threads: Number of threads to use.
+            `1` calls func on all items in the calling thread. Default is `1`.
+
+    Returns:
+        The results of func over all chunks, in order.
+    """
+    if n_threads <= 1 or len(items) <= 1:
+        return func(items)
+    size = ceil(len(items) / min(n_threads, len(items)))
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    with ThreadPoolExecutor(len(chunks)) as pool:
+        return [result for results in pool.map(func, chunks) for result in results]
+
+
+def pipe_matches(
+    matcher: Any,
+    stream: Iterable[Any],
+    batch_size: int = 1000,
+    n_process: int = 1,
+    as_tuples: bool = False,
+) -> Iterator[Tuple[Tuple[Doc, List[Any]], Any]]:
+    """Runs a matcher over a stream of docs, optionally in worker processes.
+
+    With more than one process, batches of batch_size docs are serialized
+    with `Doc.to_bytes()` and matched by a pool of workers, each holding
+    a copy of the matcher passed once at start-up. Workers are forked
+    where the platform supports it, so the matcher is not pickled there.
+    Matched docs are rebuilt from the bytes the workers return, so they
+    keep any changes made by on match callbacks, but they are new `Doc`
+    objects rather than the ones in the stream.
+
+    Args:
+        matcher: A spaczz matcher.
+        stream: A stream of `Doc` objects,
+            or (doc, context) tuples if as_tuples is `True`.
+        batch_size: Number of docs sent to a worker at a time.
+            Default is `1000`.
+        n_process: Number of processes to match with.
+            `-1` uses all available cores. Default is `1`.
+        as_tuples: Whether stream holds (doc, context) tuples.
+            Default is `False`.
+
+    Yields:
+        ((doc, matches), context) tuples in input order.
+        context is `None` if as_tuples is `False`.
+    """
+    if n_process == -1:
+        n_process = mp.cpu_count()
+    items = iter(stream) if as_tuples else ((doc, None) for doc in stream)
+    if n_process <= 1:
+        for doc, context in items:
+            yield (doc, matcher(doc)), context
+        return
+    ctx: BaseContext
+    if "fork" in mp.get_all_start_methods():
+        ctx = mp.get_context("fork")
+    else:
+        ctx = mp.get_context()
+    with ctx.Pool(
+        n_process, initializer=_init_pipe_worker, initargs=(matcher,)
+    ) as pool:
+        while True:
+            chunk = list(islice(items, batch_size * n_process))
+            if not chunk:
+                break
+            batches = [
+                [doc.to_bytes() for doc, _ in batch]
+                for batch in minibatch(chunk, batch_size)
+            ]
+            results = (
+                (Doc(matcher.vocab).from_bytes(doc_bytes), matches)
+                for batch in pool.map(_match_batch, batches)
+                for doc_bytes, matches in batch
+            )
+            for result, (_, context) in zip(results, chunk):
+                yield result, context
+
+
+def _init_pipe_worker(matcher: Any) -> None:
+    """Stores the matcher a pipe() worker process matches with."""
+    global _pipe_matcher
+    _pipe_matcher = matcher
+
+
+def _match_batch(batch: List[bytes]) -> List[Tuple[bytes, List[Any]]]:
+    """Matches a batch of serialized docs in a pipe() worker process."""
+    results = []
+    for doc_bytes in batch:
+        doc = Doc(_pipe_matcher.vocab).from_bytes(doc_bytes)
+        matches = _pipe_matcher(doc)
+        results.append((doc.to_bytes(), matches))
+    return results
@@ -2,6 +2,7 @@
 from typing import List, Tuple
 
 import pytest
+from pytest_mock import MockerFixture
 from spacy.language import Language
 from spacy.tokens import Doc, Span
 
@@ -132,6 +133,27 @@ def test_remove_label(matcher: FuzzyMatcher, nlp: Language) -> None:
     assert "TEST" not in matcher
 
 
+def test_add_compiles_pattern_records(nlp: Language) -> None:
+    """It compiles each pattern with its resolved kwargs once."""
+    matcher = FuzzyMatcher(nlp.vocab, min_r2=80)
+    matcher.add(
+        "ANIMAL",
+        [nlp.make_doc("Heifer"), nlp.make_doc("Barn Owl")],
+        [{"ignore_case": False}, {}],
+    )
+    heifer, owl = matcher._records["ANIMAL"]
+    assert heifer.key == ("ANIMAL", 0)
+    assert heifer.text == "Heifer"
+    assert heifer.kwargs == {"ignore_case": False}
+    assert heifer.settings.min_r2 == 75
+    assert owl.text == "barn owl"
+    assert (owl.n_tokens, owl.n_chars) == (2, 8)
+    assert owl.qgrams == {"bar", "arn", "rn ", "n o", " ow", "owl"}
+    assert owl.settings.min_r2 == 80
+    matcher.remove("ANIMAL")
+    assert not matcher._records
+
+
 def test_remove_label_raises_error_if_label_not_in_matcher(
     matcher: FuzzyMatcher,
 ) -> None:
@@ -140,6 +162,94 @@ def test_remove_label_raises_error_if_label_not_in_matcher(
         matcher.remove("TEST")
 
 
+def test_remove_label_clears_qgram_index(nlp: Language) -> None:
+    """It drops a removed label's patterns from the q-gram index."""
+    matcher = FuzzyMatcher(nlp.vocab)
+    matcher.add("TEST", [nlp.make_doc("test"), nlp.make_doc("tested")])
+    matcher.add("OTHER", [nlp.make_doc("testy")])
+    matcher.remove("TEST")
+    assert matcher._qgram_counts == {("OTHER", 0): 3}
+    assert all(keys == {("OTHER", 0)} for keys in matcher._qgram_index.values())
+
+
+def test_remove_label_clears_exact_matchers(nlp: Language) -> None:
+    """It drops a removed label's patterns from the exact match fast path."""
+    matcher = FuzzyMatcher(nlp.vocab, exact_fast_path=True)
+    matcher.add("TEST", [nlp.make_doc("test")])
+    matcher.add("OTHER", [nlp.make_doc("testy")])
+    matcher.remove("TEST")
+    assert list(matcher._exact_keys.values()) == [("OTHER", 0)]
+    assert len(matcher._exact_matchers[True]) == 1
+
+
+def test_qgram_filter_keeps_matches_above_overlap(nlp: Language, doc: Doc) -> None:
+    """Windows sharing enough q-grams with a pattern are still matched."""
+    matcher = FuzzyMatcher(nlp.vocab, min_qgram_overlap=0.2)
+    matcher.add("ANIMAL", [nlp.make_doc("Heifer"), nlp.make_doc("chicken")])
+    matcher.add("SOUND", [nlp.make_doc("mooo")])
+    assert matcher(doc) == [
+        ("ANIMAL", 1, 2, 83),
+        ("SOUND", 4, 5, 80),
+        ("ANIMAL", 16, 17, 83),
+    ]
+
+
+def test_qgram_filter_skips_windows_below_overlap(nlp: Language, doc: Doc) -> None:
+    """Windows sharing too few q-grams with a pattern are not compared."""
+    matcher = FuzzyMatcher(nlp.vocab, min_qgram_overlap=0.25)
+    matcher.add("ANIMAL", [nlp.make_doc("Heifer"), nlp.make_doc("chicken")])
+    assert matcher(doc) == [("ANIMAL", 1, 2, 83)]
+
+
+def test_qgram_filter_compares_patterns_shorter_than_q(nlp: Language) -> None:
+    """Patterns with no q-grams are compared against every window."""
+    matcher = FuzzyMatcher(nlp.vocab, min_qgram_overlap=1.0)
+    matcher.add("SHORT", [nlp.make_doc("ox")])
+    assert matcher(nlp.make_doc("An Ox.")) == [("SHORT", 1, 2, 100)]
+
+
+def test_remove_label_clears_deletes_index(nlp: Language) -> None:
+    """It drops a removed label's patterns from the deletion index."""
+    matcher = FuzzyMatcher(nlp.vocab, max_edit_distance=1)
+    matcher.add("TEST", [nlp.make_doc("test")])
+    matcher.add("OTHER", [nlp.make_doc("ox")])
+    matcher.remove("TEST")
+    assert matcher._deletes_keys == {("OTHER", 0)}
+    assert sorted(matcher._deletes_index) == ["o", "ox", "x"]
+
+
+def test_deletes_filter_keeps_tokens_within_max_edit_distance(
+    nlp: Language, doc: Doc
+) -> None:
+    """Single-token patterns are compared to tokens within the distance."""
+    matcher = FuzzyMatcher(nlp.vocab, max_edit_distance=2)
+    matcher.add("ANIMAL", [nlp.make_doc("Heifer"), nlp.make_doc("chicken")])
+    matcher.add("NAME", [nlp.make_doc("Steven")])
+    assert matcher(doc) == [
+        ("ANIMAL", 1, 2, 83),
+        ("ANIMAL", 16, 17, 83),
+        ("NAME", 18, 19, 77),
+    ]
+
+
+def test_deletes_filter_skips_tokens_beyond_max_edit_distance(
+    nlp: Language, doc: Doc
+) -> None:
+    """Tokens further from a single-token pattern are not compared."""
+    matcher = FuzzyMatcher(nlp.vocab, max_edit_distance=1)
+    matcher.add("ANIMAL", [nlp.make_doc("Heifer"), nlp.make_doc("chicken")])
+    matcher.add("SOUND", [nlp.make_doc("I'm a cow")])
+    assert matcher._deletes_keys == {("ANIMAL", 0), ("ANIMAL", 1)}
+    assert matcher(doc) == [("ANIMAL", 1, 2, 83), ("SOUND", 6, 10, 100)]
+
+
+def test_deletes_filter_combines_with_qgram_filter(nlp: Language, doc: Doc) -> None:
+    """Windows must pass both filters when both are enabled."""
+    matcher = FuzzyMatcher(nlp.vocab, min_qgram_overlap=0.25, max_edit_distance=2)
+    matcher.add("ANIMAL", [nlp.make_doc("Heifer"), nlp.make_doc("chicken")])
+    assert matcher(doc) == [("ANIMAL", 1, 2, 83)]
+
+
 def test_matcher_returns_matches(matcher: FuzzyMatcher, doc: Doc) -> None:
     """Calling the matcher on a Doc object returns matches."""
     assert matcher(doc) == [
@@ -214,3 +324,70 @@ def test_matcher_pipe_with_matches_and_context(nlp: Language) -> None:
         ([("DRAGON", 4, 5, 86)], "Jund"),
         ([("DRAGON", 4, 5, 91)], "Jund"),
     ]
+
+
+def test_matcher_pipe_with_processes(nlp: Language) -> None:
+    """It matches batches in worker processes and keeps input order."""
+    names = ["Steven", "Stephen", "Stefan", "Stephanie", "Steve"]
+    doc_stream = (
+        (nlp.make_doc(f"test doc {i}: {name}"), i) for i, name in enumerate(names)
+    )
+    matcher = FuzzyMatcher(nlp.vocab)
+    matcher.add("NAME", [nlp.make_doc("Steven")], on_match=add_name_ent)
+    output = list(
+        matcher.pipe(
+            doc_stream, batch_size=2, return_matches=True, as_tuples=True, n_process=2
+        )
+    )
+    assert [context for _, context in output] == list(range(len(names)))
+    for (doc, matches), context in output:
+        assert doc.text == f"test doc {context}: {names[context]}"
+        assert [(ent.start, ent.end) for ent in doc.ents] == [
+            (start, end) for _, start, end, _ in matches
+        ]
+    assert output[1][0][1] == [("NAME", 4, 5, 77)]
+
+
+def test_matcher_with_threads_returns_same_matches(
+    matcher: FuzzyMatcher, doc: Doc, nlp: Language
+) -> None:
+    """Splitting patterns across threads does not change the matches."""
+    matcher.add("SOUND", [nlp.make_doc("cow"), nlp.make_doc("moo")])
+    expected = matcher(doc)
+    matcher.n_threads = 3
+    assert matcher(nlp.make_doc(doc.text)) == expected
+
+
+def test_matcher_with_exact_fast_path_returns_same_matches(
+    matcher: FuzzyMatcher, doc: Doc, nlp: Language
+) -> None:
+    """Finding exact occurrences first does not change the matches."""
+    doc = nlp.make_doc(doc.text + " A chicken and a heifer, Heifer.")
+    expected = matcher(doc)
+    fast_matcher = FuzzyMatcher(nlp.vocab, exact_fast_path=True)
+    for label, patterns in matcher._patterns.items():
+        fast_matcher.add(label, patterns["patterns"], patterns["kwargs"])
+    assert fast_matcher(doc) == expected
+
+
+def test_matcher_with_exact_fast_path_only_finds_exact_matches_at_min_r2_100(
+    nlp: Language, doc: Doc, mocker: MockerFixture
+) -> None:
+    """Patterns with a min_r2 of 100 are not fuzzy matched."""
+    matcher = FuzzyMatcher(nlp.vocab, exact_fast_path=True, min_r2=100)
+    matcher.add("ANIMAL", [nlp.make_doc("heffer"), nlp.make_doc("chicken")])
+    spy = mocker.spy(matcher._searcher, "match_many")
+    assert matcher(doc) == [("ANIMAL", 1, 2, 100)]
+    assert spy.call_count == 0
+
+
+def test_matcher_weighted_flex_matches_full_ratios(nlp: Language) -> None:
+    """Flex optimization with WRatio uses the real ratio of each window."""
+    matcher = FuzzyMatcher(nlp.vocab)
+    matcher.add(
+        "FRUIT",
+        [nlp.make_doc("APPLE banana , grape")],
+        kwargs=[{"fuzzy_func": "weighted", "flex": 1}],
+    )
+    doc = nlp.make_doc("of the of , apple grape grap aple APPLE x")
+    assert matcher(doc) == [("FRUIT", 3, 5, 90), ("FRUIT", 7, 9, 86)]
@@ -201,3 +201,33 @@ def test_matcher_pipe_with_matches_and_context(nlp: Language) -> None:
         ([("GPE", 4, 6, (0, 0, 0))], "Country"),
         ([("GPE", 4, 5, (0, 0, 0))], "Country"),
     ]
+
+
+def test_matcher_pipe_with_processes(nlp: Language) -> None:
+    """It yields docs and matches in input order when using worker processes."""
+    doc_stream = (
+        nlp.make_doc("test doc 1: United States"),
+        nlp.make_doc("test doc 2: US"),
+        nlp.make_doc("test doc 3: Canada"),
+    )
+    matcher = RegexMatcher(nlp.vocab)
+    matcher.add("GPE", ["[Uu](nited|\\.?) ?[Ss](tates|\\.?)"])
+    output = matcher.pipe(doc_stream, batch_size=1, return_matches=True, n_process=2)
+    assert [(doc.text, matches) for doc, matches in output] == [
+        ("test doc 1: United States", [("GPE", 4, 6, (0, 0, 0))]),
+        ("test doc 2: US", [("GPE", 4, 5, (0, 0, 0))]),
+        ("test doc 3: Canada", []),
+    ]
+
+
+def test_matcher_with_threads_returns_same_matches(nlp: Language) -> None:
+    """Splitting patterns across threads does not change the matches."""
+    doc = nlp.make_doc("I live in the United States, or the US, near Canada.")
+    patterns = ["[Uu](nited|\\.?) ?[Ss](tates|\\.?)", "Canada", "live", "near"]
+    single = RegexMatcher(nlp.vocab)
+    threaded = RegexMatcher(nlp.vocab, n_threads=3)
+    for i, pattern in enumerate(patterns):
+        single.add(f"LABEL{i}", [pattern])
+        threaded.add(f"LABEL{i}", [pattern])
+    assert threaded(doc) == single(doc)
+    assert len(single(doc)) == 5
@@ -1,10 +1,13 @@
 """Tests for the similaritymatcher module."""
+import numpy as np
 import pytest
+import spacy
 from spacy.language import Language
 from spacy.tokens import Doc
 
 from spaczz.exceptions import MissingVectorsWarning
 from spaczz.matcher.similaritymatcher import SimilarityMatcher
+from spaczz.search import SimilaritySearcher
 
 
 @pytest.fixture
@@ -55,3 +58,83 @@ def test_matcher_w_vocab_wo_vectors_raises_warning(nlp: Language) -> None:
     """It raises a warning if matcher initialized with Vocab wo vectors."""
     with pytest.warns(MissingVectorsWarning):
         SimilarityMatcher(nlp.vocab)
+
+
+@pytest.fixture
+def vectors_nlp() -> Language:
+    """Blank pipeline with small random word vectors."""
+    nlp = spacy.blank("en")
+    rng = np.random.RandomState(0)
+    for word in ["the", "cat", "sat", "on", "a", "mat", "dog", "ran"]:
+        nlp.vocab.set_vector(word, rng.uniform(-1, 1, 8).astype("float32"))
+    return nlp
+
+
+def test_add_precomputes_normalized_pattern_vectors(vectors_nlp: Language) -> None:
+    """It stores one unit length float32 row per added pattern."""
+    matcher = SimilarityMatcher(vectors_nlp.vocab)
+    matcher.add("ANIMAL", [vectors_nlp("cat"), vectors_nlp("dog ran")])
+    matcher.add("OTHER", [vectors_nlp("the mat")])
+    vectors = matcher._searcher._query_vectors
+    assert vectors.shape == (3, 8)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
+
+
+def test_remove_drops_pattern_vectors(vectors_nlp: Language) -> None:
+    """It removes a label's rows from the pattern vector matrix."""
+    matcher = SimilarityMatcher(vectors_nlp.vocab)
+    dog = vectors_nlp("dog ran")
+    matcher.add("ANIMAL", [vectors_nlp("cat")])
+    matcher.add("OTHER", [dog])
+    matcher.remove("ANIMAL")
+    assert dict(matcher._searcher._query_rows) == {dog: 0}
+    assert np.allclose(
+        matcher._searcher._query_vectors[0], dog.vector / dog.vector_norm
+    )
+
+
+def test_remove_keeps_vectors_of_patterns_shared_with_other_labels(
+    vectors_nlp: Language,
+) -> None:
+    """A pattern added under two labels keeps its row until both are removed."""
+    matcher = SimilarityMatcher(vectors_nlp.vocab)
+    dog = vectors_nlp("dog ran")
+    matcher.add("ANIMAL", [dog])
+    matcher.add("OTHER", [dog])
+    matcher.remove("ANIMAL")
+    assert dict(matcher._searcher._query_rows) == {dog: 0}
+    assert matcher._searcher._query_vectors.shape == (1, 8)
+    matcher.remove("OTHER")
+    assert dict(matcher._searcher._query_rows) == {}
+    assert matcher._searcher._query_vectors.shape == (0, 8)
+
+
+def test_remove_drops_vectors_of_patterns_added_in_several_calls(
+    vectors_nlp: Language,
+) -> None:
+    """Adding to a label again only registers the new patterns' vectors."""
+    matcher = SimilarityMatcher(vectors_nlp.vocab)
+    cat, dog = vectors_nlp("cat"), vectors_nlp("dog ran")
+    matcher.add("ANIMAL", [cat])
+    matcher.add("ANIMAL", [dog])
+    assert dict(matcher._searcher._query_refs) == {cat: 1, dog: 1}
+    matcher.remove("ANIMAL")
+    assert dict(matcher._searcher._query_rows) == {}
+    assert matcher._searcher._query_vectors.shape == (0, 8)
+
+
+def test_matcher_with_pattern_vectors_matches_searcher(vectors_nlp: Language) -> None:
+    """Matching with precomputed pattern vectors finds the same matches."""
+    doc = vectors_nlp("the cat sat on a mat and the dog ran")
+    patterns = [vectors_nlp("cat sat"), vectors_nlp("dog"), vectors_nlp("a mat")]
+    kwargs = [{"min_r1": 30, "min_r2": 60}, {}, {"min_r2": 90}]
+    matcher = SimilarityMatcher(vectors_nlp.vocab)
+    matcher.add("TEST", patterns, kwargs=kwargs)
+    searcher = SimilaritySearcher(vectors_nlp.vocab)
+    expected = {
+        ("TEST",) + match
+        for query, kwarg in zip(patterns, kwargs)
+        for match in searcher.match(doc, query, **kwarg)
+    }
+    assert matcher(doc) and set(matcher(doc)) == expected
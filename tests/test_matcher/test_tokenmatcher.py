@@ -1,9 +1,13 @@
 """Tests for tokenmatcher module."""
-from typing import List, Tuple
+import gc
+import pickle
+from typing import Any, Dict, List, Tuple
 
 import pytest
+from pytest_mock import MockerFixture
+import regex
 from spacy.language import Language
-from spacy.tokens import Doc, Span
+from spacy.tokens import Doc, Span, Token
 
 from spaczz.matcher import TokenMatcher
 
@@ -128,6 +132,227 @@ def test_matcher_returns_matches(matcher: TokenMatcher, example: Doc) -> None:
     ]
 
 
+def test_matcher_indexes_simple_fuzzy_pattern_tokens(nlp: Language) -> None:
+    """Only "simple" FUZZY pattern tokens are looked up in the BK-tree."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add(
+        "DRUG",
+        [
+            [{"LOWER": {"FUZZY": "Zithromax"}}],
+            [{"TEXT": {"FUZZY": "Advair", "FUZZY_FUNC": "quick"}}],
+        ],
+    )
+    doc = nlp("zithramax and advar or zyrtec")
+    assert matcher._term_candidates(doc) == {(True, "Zithromax"): {"zithramax"}}
+    assert matcher(doc) == [("DRUG", 0, 1, None), ("DRUG", 2, 3, None)]
+
+
+def test_matcher_shares_token_specs_until_removed(nlp: Language) -> None:
+    """Pattern tokens matched the same way share one spec id."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    matcher.add("OTHER", [[{"LOWER": {"FUZZY": "Advair", "MIN_R": 75}}]])
+    assert matcher._spec_ids == {(True, "FUZZY", "Advair", 75, "simple"): 0}
+    matcher.remove("DRUG")
+    assert matcher(nlp("advar")) == [("OTHER", 0, 1, None)]
+    matcher.remove("OTHER")
+    assert not matcher._spec_ids
+
+
+def test_matcher_gives_new_specs_unused_ids(nlp: Language) -> None:
+    """Spec ids are not reused after the specs holding them are removed."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("A", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    matcher.add("B", [[{"LOWER": {"FUZZY": "Zyrtec"}}]])
+    matcher.remove("A")
+    matcher.add("C", [[{"LOWER": {"FUZZY": "Flonase"}}]])
+    assert sorted(matcher._spec_ids.values()) == [1, 2]
+    assert matcher(nlp("zyrtek flonaze")) == [("B", 0, 1, None), ("C", 1, 2, None)]
+
+
+def test_matchers_on_the_same_doc_keep_their_own_spec_ids(
+    nlp: Language, mocker: MockerFixture
+) -> None:
+    """A matcher run on a doc while another matches it does not clear its ids."""
+    drugs = TokenMatcher(nlp.vocab)
+    drugs.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    names = TokenMatcher(nlp.vocab)
+    names.add("NAME", [[{"TEXT": {"FUZZY": "Ridley"}}]])
+    doc = nlp("Rdley took advar")
+    spacy_matcher = drugs._matcher
+    nested: List[List[Tuple[str, int, int, None]]] = []
+
+    def match_names_first(doc: Doc) -> List[Tuple[int, int, int]]:
+        nested.append(names(doc))
+        return spacy_matcher(doc)
+
+    mocker.patch.object(drugs, "_matcher", side_effect=match_names_first)
+    assert drugs(doc) == [("DRUG", 2, 3, None)]
+    assert nested == [[("NAME", 0, 1, None)]]
+
+
+def test_matcher_can_be_pickled(nlp: Language) -> None:
+    """Matchers with compiled token specs survive pickling, e.g. for spawn pools."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add(
+        "DRUG",
+        [[{"LOWER": {"FUZZY": "Advair"}}], [{"TEXT": {"FREGEX": "(Zyrtec){e<=1}"}}]],
+    )
+    copy = pickle.loads(pickle.dumps(matcher))
+    assert copy(nlp("advar or Zyrtek")) == [("DRUG", 0, 1, None), ("DRUG", 2, 3, None)]
+
+
+def test_matcher_removes_its_token_extension_when_collected(nlp: Language) -> None:
+    """Each matcher's spec id extension is unregistered with the matcher."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    matcher(nlp("advar"))
+    attr = matcher._spec_attr
+    assert Token.has_extension(attr)
+    del matcher
+    gc.collect()
+    assert not Token.has_extension(attr)
+
+
+def test_matcher_caches_token_texts_across_docs(nlp: Language) -> None:
+    """Token texts seen in earlier docs are not compared again."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    assert matcher(nlp("advar or advar")) == [
+        ("DRUG", 0, 1, None),
+        ("DRUG", 2, 3, None),
+    ]
+    assert matcher(nlp("advar")) == [("DRUG", 0, 1, None)]
+    assert matcher.cache_stats["hits"] == 1
+    matcher.add("OTHER", [[{"LOWER": {"FREGEX": "adv"}}]])
+    assert matcher(nlp("advar")) == [("DRUG", 0, 1, None), ("OTHER", 0, 1, None)]
+    assert matcher.cache_stats["hits"] == 1
+
+
+def test_matcher_evicts_least_recently_used_token_texts(nlp: Language) -> None:
+    """The cache holds at most cache_size token texts."""
+    matcher = TokenMatcher(nlp.vocab, cache_size=2)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    matcher(nlp("advar or zyrtec"))
+    assert len(matcher._spec_cache) == 2
+    assert matcher.cache_stats["evictions"] == 1
+
+
+def test_matcher_compiles_each_fregex_pattern_once(nlp: Language) -> None:
+    """Distinct FREGEX strings are compiled once and dropped with their labels."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add(
+        "DB",
+        [[{"TEXT": {"FREGEX": "(sql){i<=3}"}}], [{"LOWER": {"FREGEX": "(sql){i<=3}"}}]],
+    )
+    matcher.add("OTHER", [[{"TEXT": {"FREGEX": "(db){e<=1}"}}]])
+    assert matcher.regex_stats["patterns"] == 2
+    assert matcher.patterns[0]["pattern"] == [{"TEXT": {"FREGEX": "(sql){i<=3}"}}]
+    matcher.remove("OTHER")
+    assert list(matcher._regexes) == ["(sql){i<=3}"]
+    assert matcher(nlp("sequel")) == [("DB", 0, 1, None)]
+
+
+def test_matcher_rejects_invalid_fregex_patterns_when_added(nlp: Language) -> None:
+    """Invalid FREGEX patterns raise when added and are not kept."""
+    matcher = TokenMatcher(nlp.vocab)
+    with pytest.raises(regex.error):
+        matcher.add("DB", [[{"TEXT": {"FREGEX": "(sql"}}]])
+    assert not matcher._regexes
+    assert not matcher._spec_ids
+
+
+@pytest.mark.parametrize(
+    "bad_pattern",
+    [[{"TEXT": {"FREGEX": "(sql"}}], [{"LOWER": {"FUZZY": "Zyrtec"}, "FOO": "x"}]],
+)
+def test_matcher_is_unchanged_when_a_later_pattern_is_invalid(
+    nlp: Language, bad_pattern: List[Dict[str, Any]]
+) -> None:
+    """Patterns added before an invalid one in the same call are not kept."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    with pytest.raises((ValueError, regex.error)):
+        matcher.add(
+            "OTHER",
+            [[{"TEXT": "took"}, {"LOWER": {"FUZZY": "Flonase"}}], bad_pattern],
+        )
+    assert "OTHER" not in matcher
+    assert matcher.patterns == [
+        {"label": "DRUG", "pattern": [{"LOWER": {"FUZZY": "Advair"}}], "type": "token"}
+    ]
+    assert matcher._spec_counts == {(True, "FUZZY", "Advair", 75, "simple"): 1}
+    assert list(matcher._spec_funcs) == list(matcher._spec_ids)
+    assert dict(matcher._anchors) == {"DRUG": [None]}
+    assert not matcher._regexes
+    assert matcher(nlp("advar took flonaze")) == [("DRUG", 0, 1, None)]
+    matcher.remove("DRUG")
+    assert not matcher._spec_ids
+
+
+def test_matcher_applies_operators_to_fuzzy_patterns(nlp: Language) -> None:
+    """Operators work alongside FUZZY tokens."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add(
+        "NAME",
+        [
+            [
+                {"TEXT": {"FUZZY": "Ridley"}},
+                {"IS_PUNCT": True, "OP": "?"},
+                {"TEXT": {"FUZZY": "Scott"}},
+            ]
+        ],
+    )
+    assert matcher(nlp("Rdley Scot")) == [("NAME", 0, 2, None)]
+
+
+def test_matcher_rebuilds_term_index_after_changes(nlp: Language) -> None:
+    """Adding or removing patterns refreshes the BK-tree."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRUG", [[{"LOWER": {"FUZZY": "Zithromax"}}]])
+    doc = nlp("zithramax and advar")
+    assert matcher(doc) == [("DRUG", 0, 1, None)]
+    matcher.add("OTHER", [[{"LOWER": {"FUZZY": "Advair"}}]])
+    assert matcher(doc) == [("DRUG", 0, 1, None), ("OTHER", 2, 3, None)]
+    matcher.remove("DRUG")
+    assert matcher(doc) == [("OTHER", 2, 3, None)]
+    assert list(matcher._term_trees) == [True]
+
+
+def test_matcher_only_compares_tokens_near_exact_anchors(nlp: Language) -> None:
+    """FUZZY tokens are only compared next to their pattern's TEXT or LOWER token."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add(
+        "NAME",
+        [
+            [{"TEXT": "Ridley"}, {"TEXT": {"FUZZY": "Scott"}}],
+            [{"LOWER": {"FREGEX": "(sir){e<=1}"}}, {"LOWER": "ridley"}],
+        ],
+    )
+    doc = nlp("Scot met Sr RIDLEY and Ridley Scot")
+    assert matcher._anchor_positions(doc) == {2, 4, 6}
+    assert matcher(doc) == [("NAME", 2, 4, None), ("NAME", 5, 7, None)]
+    assert len(matcher._spec_cache) == 3
+
+
+def test_matcher_compares_every_token_with_unanchored_patterns(
+    nlp: Language,
+) -> None:
+    """Patterns without exact tokens or with operators cannot be anchored."""
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("NAME", [[{"TEXT": "Ridley", "OP": "?"}, {"TEXT": {"FUZZY": "Scott"}}]])
+    doc = nlp("Scot met Ridley Scot")
+    assert matcher._anchor_positions(doc) is None
+    assert matcher(doc) == [
+        ("NAME", 0, 1, None),
+        ("NAME", 2, 4, None),
+        ("NAME", 3, 4, None),
+    ]
+    matcher.remove("NAME")
+    matcher.add("NAME", [[{"TEXT": "Ridley"}, {"TEXT": {"FUZZY": "Scott"}}]])
+    assert matcher._anchor_positions(doc) == {3}
+
+
 def test_matcher_returns_empty_list_if_no_matches(nlp: Language) -> None:
     """Calling the matcher on a `Doc` object with no matches returns empty list."""
     matcher = TokenMatcher(nlp.vocab)
@@ -137,12 +362,10 @@ def test_matcher_returns_empty_list_if_no_matches(nlp: Language) -> None:
 
 
 def test_matcher_warns_if_unknown_pattern_elements(nlp: Language) -> None:
-    """Calling the matcher on a `Doc` object with no matches returns empty list."""
+    """Adding patterns with unknown elements warns as they are compiled."""
     matcher = TokenMatcher(nlp.vocab)
-    matcher.add("TEST", [[{"TEXT": {"fuzzy": "test"}}]])
-    doc = nlp("test")
     with pytest.warns(UserWarning):
-        matcher(doc)
+        matcher.add("TEST", [[{"TEXT": {"fuzzy": "test"}}]])
 
 
 def test_matcher_uses_on_match_callback(matcher: TokenMatcher, example: Doc) -> None:
@@ -205,3 +428,14 @@ def test_matcher_pipe_with_matches_and_context(nlp: Language) -> None:
         ([("DRAGON", 4, 5, None)], "Jund"),
         ([("DRAGON", 4, 5, None)], "Jund"),
     ]
+
+
+def test_matcher_pipe_with_processes(nlp: Language) -> None:
+    """It yields docs in input order when using worker processes."""
+    doc_stream = (nlp(f"test doc {i}: Corvold") for i in range(5))
+    matcher = TokenMatcher(nlp.vocab)
+    matcher.add("DRAGON", [[{"TEXT": {"FUZZY": "Korvold"}}]])
+    output = matcher.pipe(doc_stream, batch_size=2, return_matches=True, n_process=2)
+    assert [(doc.text, matches) for doc, matches in output] == [
+        (f"test doc {i}: Corvold", [("DRAGON", 4, 5, None)]) for i in range(5)
+    ]
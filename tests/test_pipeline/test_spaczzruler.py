@@ -285,6 +285,60 @@ def test_spaczz_ruler_to_from_disk(
     assert new_ruler.overwrite is True
 
 
+def test_spaczz_ruler_serialization_keeps_fuzzy_indexes(
+    nlp: Language, patterns: List[Dict[str, Any]]
+) -> None:
+    """Loaded rulers index fuzzy patterns with the saved fuzzy defaults."""
+    ruler = SpaczzRuler(
+        nlp,
+        spaczz_patterns=patterns,
+        spaczz_fuzzy_defaults={"max_edit_distance": 2},
+    )
+    bytes_ruler = SpaczzRuler(nlp).from_bytes(ruler.to_bytes())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ruler.to_disk(f"{tmpdir}/ruler")
+        disk_ruler = SpaczzRuler(nlp).from_disk(f"{tmpdir}/ruler")
+    for new_ruler in (bytes_ruler, disk_ruler):
+        assert new_ruler.fuzzy_matcher.max_edit_distance == 2
+        new_index = new_ruler.fuzzy_matcher._deletes_index
+        assert new_index == ruler.fuzzy_matcher._deletes_index
+
+
+def test_spaczz_ruler_serialization_resets_every_matcher(nlp: Language) -> None:
+    """Loaded rulers match with the saved defaults of each matcher."""
+    ruler = SpaczzRuler(
+        nlp,
+        spaczz_patterns=[
+            {"label": "AUTHOR", "pattern": "Kerouac", "type": "fuzzy"},
+            {"label": "PREFIX", "pattern": "Salin", "type": "regex"},
+            {
+                "label": "NAME",
+                "pattern": [{"TEXT": {"FUZZY": "Ginsberg"}}],
+                "type": "token",
+            },
+        ],
+        spaczz_fuzzy_defaults={"min_r2": 95},
+        spaczz_regex_defaults={"partial": False},
+        spaczz_token_defaults={"min_r": 95},
+    )
+    text = "Kerouc met Salinger and Ginsbrg"
+    assert not ruler(nlp(text)).ents
+    loose = {
+        "spaczz_fuzzy_defaults": {"min_r2": 50},
+        "spaczz_regex_defaults": {"partial": True},
+        "spaczz_token_defaults": {"min_r": 50},
+    }
+    bytes_ruler = SpaczzRuler(nlp, **loose).from_bytes(ruler.to_bytes())
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ruler.to_disk(f"{tmpdir}/ruler")
+        disk_ruler = SpaczzRuler(nlp, **loose).from_disk(f"{tmpdir}/ruler")
+    for new_ruler in (bytes_ruler, disk_ruler):
+        assert new_ruler.fuzzy_matcher.defaults == {"min_r2": 95}
+        assert new_ruler.regex_matcher.defaults == {"partial": False}
+        assert new_ruler.token_matcher.defaults == {"min_r": 95}
+        assert not new_ruler(nlp(text)).ents
+
+
 def test_spaczz_patterns_to_from_disk(
     nlp: Language, patterns: List[Dict[str, Any]]
 ) -> None:
@@ -1,10 +1,200 @@
 """Tests for process module."""
 import pytest
+from rapidfuzz import fuzz
+from spacy.language import Language
 
-from spaczz.process import FuzzyFuncs
+from spaczz.process import (
+    BKTree,
+    cutoff_ratio,
+    doc_cache,
+    FuzzyFuncs,
+    indel_ratio_bound,
+    LRUCache,
+    map_token_offsets,
+    max_indel_distance,
+    myers_search,
+    score_matrix,
+)
+
+
+def lev(a: str, b: str) -> int:
+    """Levenshtein distance between a and b."""
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        prev, row[0] = row[0], i
+        for j, char_b in enumerate(b, start=1):
+            prev, row[j] = row[j], min(
+                row[j] + 1, row[j - 1] + 1, prev + (char_a != char_b)
+            )
+    return row[-1]
 
 
 def test_fuzzyfuncs_raises_value_error_w_unkown_match_type() -> None:
     """The searcher with lower-cased text is working as intended."""
     with pytest.raises(ValueError):
         FuzzyFuncs(match_type="unknown")
+
+
+def test_map_token_offsets_slices_span_text(nlp: Language) -> None:
+    """Token offsets slice the same text as spans."""
+    doc = nlp("Don't call me  Sh1rley!")
+    starts, ends = map_token_offsets(doc)
+    assert doc.text[starts[1] : ends[4]] == doc[1:5].text
+
+
+def test_doc_cache_is_shared_per_doc(nlp: Language) -> None:
+    """The same cache is returned for a doc until it is retokenized."""
+    doc = nlp("Don't call me  Sh1rley!")
+    cache = doc_cache(doc)
+    assert doc_cache(doc) is cache
+    assert cache.lower == doc.text.lower()
+    assert cache.token_texts == [token.text for token in doc]
+    assert cache.chars_to_tokens[doc[4].idx] == 4
+    with doc.retokenize() as retokenizer:
+        retokenizer.merge(doc[3:5])
+    assert doc_cache(doc) is not cache
+    assert doc_cache(doc).token_texts == [token.text for token in doc]
+
+
+def test_doc_cache_is_rebuilt_when_retokenized_to_same_length(nlp: Language) -> None:
+    """Merging and splitting tokens without changing their count rebuilds it."""
+    doc = nlp("New York is big")
+    cache = doc_cache(doc)
+    assert cache.token_texts == ["New", "York", "is", "big"]
+    with doc.retokenize() as retokenizer:
+        retokenizer.merge(doc[0:2])
+        retokenizer.split(doc[3], ["b", "ig"], heads=[doc[3], doc[3]])
+    assert len(doc) == 4
+    assert doc_cache(doc) is not cache
+    assert doc_cache(doc).token_texts == ["New York", "is", "b", "ig"]
+
+
+def test_doc_cache_memo_calls_factory_once(nlp: Language) -> None:
+    """Memoized data is only computed once."""
+    doc = nlp("Hello World")
+    calls = []
+    for _ in range(2):
+        doc_cache(doc).memo("key", lambda: calls.append(1))
+    assert len(calls) == 1
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    """Looking an entry up keeps it from being evicted next."""
+    cache: LRUCache[str, int] = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats == {"hits": 3, "misses": 1, "evictions": 1}
+    assert cache.hit_rate == 0.75
+
+
+def test_lru_cache_with_maxsize_0_keeps_nothing() -> None:
+    """A cache with no capacity never holds entries."""
+    cache: LRUCache[str, int] = LRUCache(maxsize=0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+
+
+def test_lru_cache_raises_value_error_w_negative_maxsize() -> None:
+    """Negative capacities are rejected."""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
+
+
+def test_cutoff_ratio_keeps_ratios_that_round_up_to_min_r() -> None:
+    """Ratios just under min_r that round up to it are kept."""
+    assert fuzz.ratio("abcdefghijklm", "abcdefghijklmno") < 93
+    assert cutoff_ratio(fuzz.ratio, "abcdefghijklm", "abcdefghijklmno", 93) == 93
+    assert cutoff_ratio(fuzz.ratio, "abcdefghijklm", "abcdefghijklmno", 94) == 0
+
+
+def test_cutoff_ratio_scores_weighted_ratios_in_full() -> None:
+    """Weighted ratios above min_r are kept though rapidfuzz drops them."""
+    ratio = round(fuzz.WRatio("APPLE banana , grape", "grap aple APPLE"))
+    assert ratio >= 64
+    assert cutoff_ratio(fuzz.WRatio, "APPLE banana , grape", "grap aple APPLE", 64) == (
+        ratio
+    )
+    assert score_matrix(
+        ["APPLE banana , grape"], ["grap aple APPLE"], fuzz.WRatio, score_cutoff=63.5
+    ).tolist() == [[ratio]]
+
+
+def test_score_matrix_applies_score_cutoff() -> None:
+    """Scores below the cutoff are returned as 0."""
+    scores = score_matrix(["spacy"], ["spaczz", "spacy"], fuzz.ratio, score_cutoff=80)
+    assert scores.tolist() == [[0, 100]]
+
+
+def test_indel_ratio_bound_is_upper_bound_of_ratio() -> None:
+    """The length bound is never lower than the actual ratio."""
+    pairs = [("spaczz", "spacy"), ("a", "abcdef"), ("abc", "xyz"), ("", "")]
+    for a, b in pairs:
+        assert fuzz.ratio(a, b) <= indel_ratio_bound(len(a), len(b))
+
+
+def test_get_length_bound_uses_processed_lengths() -> None:
+    """Bounds for functions that pre-process strings use processed lengths."""
+    ff = FuzzyFuncs()
+    assert ff.get_length_bound("simple").len(" Hi! ") == 5
+    assert ff.get_length_bound("quick").len(" Hi! ") == 2
+    assert ff.get_length_bound("partial") is None
+
+
+def test_score_matrix_skips_pairs_ruled_out_by_length_bound() -> None:
+    """Pairs that cannot reach the cutoff are returned as 0."""
+    ff = FuzzyFuncs()
+    scores = score_matrix(
+        ["spacy"],
+        ["spaczz", "spacy and more"],
+        fuzz.ratio,
+        score_cutoff=60,
+        length_bound=ff.get_length_bound("simple"),
+    )
+    assert scores.tolist() == [[73, 0]]
+
+
+def test_myers_search_matches_levenshtein_distances() -> None:
+    """Reported distances are the best Levenshtein distance ending there."""
+    text = "a spaczz doc"
+    ends = myers_search("spacy", text, 2)
+    for end, distance in ends:
+        assert distance == min(
+            lev(text[start:end], "spacy") for start in range(end + 1)
+        )
+    assert [end for end, _ in ends] == [5, 6, 7, 8]
+
+
+def test_myers_search_anchored_reports_prefix_distances() -> None:
+    """Anchored searches report the distance of each text prefix."""
+    assert myers_search("ab", "abc", 3, anchored=True) == [
+        (0, 2),
+        (1, 1),
+        (2, 0),
+        (3, 1),
+    ]
+
+
+def test_bktree_search_finds_strings_within_radius() -> None:
+    """It returns every string within the radius and no others."""
+    words = ["spacy", "spaczz", "spaces", "space", "regex", "fuzzy", "spacy"]
+    tree = BKTree(words)
+    assert len(tree) == 6
+    for radius in range(4):
+        assert sorted(tree.search("spacey", radius)) == sorted(
+            (word, lev(word, "spacey"))
+            for word in set(words)
+            if lev(word, "spacey") <= radius
+        )
+
+
+def test_max_indel_distance_bounds_strings_reaching_min_r() -> None:
+    """Strings further than the bound never reach min_r."""
+    assert max_indel_distance(5, 0) is None
+    for a, b in [("spaczz", "spacy"), ("a", "abcdef"), ("abc", "xyz")]:
+        for min_r in (50, 75, 90):
+            if cutoff_ratio(fuzz.ratio, a, b, min_r):
+                assert lev(a, b) <= max_indel_distance(len(b), min_r)
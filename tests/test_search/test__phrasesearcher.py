@@ -1,8 +1,13 @@
 """Tests for __phrasesearcher module."""
+import random
+from typing import List, Tuple
+
 import pytest
+from pytest_mock import MockerFixture
 from spacy.language import Language
 
 from spaczz.search import _PhraseSearcher
+from spaczz.search._phrasesearcher import ScoreMemo
 
 
 @pytest.fixture
@@ -23,3 +28,77 @@ def test_compare_works_with_cased_matches(
 ) -> None:
     """Checks compare is working as intended - case sensitive."""
     assert searcher.compare(nlp("spaCy"), nlp("spacy"), ignore_case=False) == 0
+
+
+def test_score_memo_reuses_scores_for_same_window() -> None:
+    """It only calls the wrapped scorer once per window and cutoff."""
+    calls = []
+
+    def scorer(start: int, end: int, min_r: int = 0) -> int:
+        calls.append((start, end, min_r))
+        return 60 if min_r <= 60 else 0
+
+    memo = ScoreMemo(scorer)
+    assert memo(0, 2, 50) == 60
+    assert memo(0, 2, 70) == 60
+    assert memo(0, 2, 0) == 60
+    assert calls == [(0, 2, 50)]
+    assert (memo.hits, memo.misses) == (2, 1)
+
+
+def test_score_memo_rescores_below_cached_cutoff() -> None:
+    """A cached 0 is not reused for a lower minimum ratio."""
+    calls = []
+
+    def scorer(start: int, end: int, min_r: int = 0) -> int:
+        calls.append(min_r)
+        return 60 if min_r <= 60 else 0
+
+    memo = ScoreMemo(scorer)
+    assert memo(0, 2, 80) == 0
+    assert memo(0, 2, 90) == 0
+    assert memo(0, 2, 50) == 60
+    assert calls == [80, 50]
+
+
+def test_match_keeps_negative_ratios_below_min_r1(
+    searcher: _PhraseSearcher, nlp: Language, mocker: MockerFixture
+) -> None:
+    """Windows scoring below 0 do not pass a min_r1 of 0."""
+    mocker.patch.object(searcher, "compare", return_value=-50)
+    assert searcher.match(nlp("a b c"), nlp("b"), min_r1=0, min_r2=0) == []
+
+
+def test_match_counts_memo_hits(
+    searcher: _PhraseSearcher, nlp: Language, mocker: MockerFixture
+) -> None:
+    """Overlapping optimization windows are only compared once per query."""
+    compare = mocker.spy(searcher, "compare")
+    doc = nlp("a b c d a b c d")
+    query = nlp("b c d")
+    assert searcher.match(doc, query, min_r1=0, min_r2=100) == [
+        (1, 4, 100),
+        (5, 8, 100),
+    ]
+    assert searcher.memo_stats["hits"] > 0
+    assert searcher.memo_stats["misses"] == compare.call_count
+
+
+def test_filter_overlapping_matches_matches_pairwise_filter() -> None:
+    """It keeps the same spans as checking each against all kept spans."""
+    rng = random.Random(0)
+    matches = []
+    for _ in range(500):
+        start = rng.randrange(200)
+        matches.append((start, start + rng.randrange(1, 6), rng.randrange(50, 101)))
+    matches.sort(key=lambda x: (-x[2], x[0]))
+    expected: List[Tuple[int, int, int]] = []
+    for match in matches:
+        if all(match[1] <= n[0] or n[1] <= match[0] for n in expected):
+            expected.append(match)
+    assert _PhraseSearcher._filter_overlapping_matches(matches) == expected
+
+
+def test_filter_overlapping_matches_with_no_matches() -> None:
+    """It returns an empty list when there is nothing to filter."""
+    assert _PhraseSearcher._filter_overlapping_matches([]) == []
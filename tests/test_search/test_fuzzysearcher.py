@@ -1,7 +1,9 @@
 """Tests for fuzzysearcher module."""
-from typing import Dict
+import random
+from typing import Any, Dict
 
 import pytest
+from rapidfuzz import fuzz
 from spacy.language import Language
 from spacy.tokens import Doc
 
@@ -43,6 +45,12 @@ def test_compare_without_ignore_case(searcher: FuzzySearcher, nlp: Language) ->
     assert searcher.compare(nlp("SPACZZ"), nlp("spaczz"), ignore_case=False) == 0
 
 
+def test_compare_returns_0_below_min_r(searcher: FuzzySearcher, nlp: Language) -> None:
+    """It returns 0 if the ratio is below min_r."""
+    assert searcher.compare(nlp("spaczz"), nlp("spacy"), min_r=73) == 73
+    assert searcher.compare(nlp("spaczz"), nlp("spacy"), min_r=74) == 0
+
+
 def test_compare_raises_error_with_unknown_func_name(
     searcher: FuzzySearcher, nlp: Language
 ) -> None:
@@ -229,6 +237,112 @@ def test_match_finds_best_matches(searcher: FuzzySearcher, nlp: Language) -> Non
     ]
 
 
+def test_match_passes_positional_args_after_min_r2_to_the_searcher(
+    searcher: FuzzySearcher, nlp: Language
+) -> None:
+    """Arguments after min_r2 go to the searcher, not to cluster or top_k."""
+    doc = nlp("chiken from Popeyes is better than Chken from Chick-fil-A")
+    query = nlp("chicken")
+    assert len(searcher.match(doc, query)) == 3
+    assert searcher.match(doc, query, "default", 50, 75, False) == [(0, 1, 92)]
+
+
+def test_match_with_cluster_optimizes_fewer_spans(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """Clustering initial matches finds the same match with fewer comparisons."""
+    query = nlp("Kareem Abdul-Jabbar")
+    exhaustive = searcher.match(adjust_example, query, min_r1=30, min_r2=70)
+    misses = searcher.memo_stats["misses"]
+    clustered = searcher.match(
+        adjust_example, query, min_r1=30, min_r2=70, cluster=True
+    )
+    assert clustered == exhaustive == [(8, 11, 89)]
+    assert searcher.memo_stats["misses"] - misses < misses
+
+
+@pytest.mark.parametrize("top_k", [1, 2, 3])
+def test_match_with_top_k_returns_first_k_matches(
+    searcher: FuzzySearcher, nlp: Language, top_k: int
+) -> None:
+    """It returns the same matches as slicing the full results."""
+    rng = random.Random(0)
+    words = ["chicken", "chiken", "chkn", "from", "Popeyes", "chick", "fil", "a"]
+    doc = nlp(" ".join(rng.choice(words) for _ in range(200)))
+    for query in [nlp("chicken"), nlp("chicken from"), nlp("Popeyes chick")]:
+        assert (
+            searcher.match(doc, query, min_r1=30, top_k=top_k)
+            == searcher.match(doc, query, min_r1=30)[:top_k]
+        )
+
+
+@pytest.mark.parametrize(
+    "text,query,kwargs,top_k",
+    [
+        (", pie pie chery the a , the pies apple", "a ,", {"min_r1": 0}, 1),
+        (
+            "aple a pies , pie a pie cherry apple",
+            "pie cherry cherry",
+            {"fuzzy_func": "weighted", "min_r1": 0, "min_r2": 0, "flex": 1},
+            2,
+        ),
+    ],
+)
+def test_match_with_top_k_breaks_ties_and_overlaps_like_match(
+    searcher: FuzzySearcher,
+    nlp: Language,
+    text: str,
+    query: str,
+    kwargs: Dict[str, Any],
+    top_k: int,
+) -> None:
+    """Ties and matches overlapping kept ones give the same top_k as match()."""
+    doc = nlp(text)
+    kwargs = {"fuzzy_func": "quick_lev", **kwargs}
+    assert (
+        searcher.match(doc, nlp(query), top_k=top_k, **kwargs)
+        == searcher.match(doc, nlp(query), **kwargs)[:top_k]
+    )
+
+
+def test__optimize_bounds_bound_spans_in_flex_region(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """No span reachable by optimizing a match scores above its bound."""
+    query = nlp("Kareem Abdul-Jabbar")
+    positions = list(range(len(adjust_example) - len(query) + 1))
+    bounds = searcher._optimize_bounds(adjust_example, query, positions, 2)
+    for pos in positions:
+        for start in range(max(pos - 2, 0), pos + 3):
+            for end in range(
+                start + 1, min(pos + len(query) + 2, len(adjust_example)) + 1
+            ):
+                assert (
+                    fuzz.ratio(
+                        query.text.lower(), adjust_example[start:end].text.lower()
+                    )
+                    <= bounds[pos] + 1e-9
+                )
+
+
+def test__optimize_bounds_only_for_simple_ratio(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """It has no bounds for other fuzzy functions."""
+    assert (
+        searcher._optimize_bounds(
+            adjust_example, nlp("Kareem"), [0], 1, True, "partial"
+        )
+        is None
+    )
+
+
+def test__cluster_keeps_best_of_overlapping_spans(searcher: FuzzySearcher) -> None:
+    """It keeps the best start index of each run of overlapping spans."""
+    match_values = {0: 60, 1: 80, 2: 70, 5: 55, 6: 55}
+    assert searcher._cluster(match_values, 2) == [1, 5]
+
+
 def test_match_return_empty_list_when_no_matches_after_scan(
     searcher: FuzzySearcher, nlp: Language
 ) -> None:
@@ -292,3 +406,130 @@ def test_match_returns_empty_list_if_doc_query_empty(
     doc = nlp("")
     query = nlp("")
     assert searcher.match(doc, query) == []
+
+
+def test__window_scorer_matches_compare(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """It scores windows the same as comparing against doc spans."""
+    query = nlp("Kareem Abdul-Jabbar")
+    scorer = searcher._window_scorer(adjust_example, query, ignore_case=False)
+    for start in range(len(adjust_example)):
+        for end in range(start + 1, len(adjust_example) + 1):
+            assert scorer(start, end) == searcher.compare(
+                query, adjust_example[start:end], ignore_case=False
+            )
+
+
+def test__window_scorer_handles_case_folding_length_changes(
+    searcher: FuzzySearcher, nlp: Language
+) -> None:
+    """It still scores correctly if lower-casing changes the text length."""
+    doc = nlp("İstanbul is in Turkey")
+    query = nlp("turkey")
+    scorer = searcher._window_scorer(doc, query)
+    assert scorer(3, 4) == searcher.compare(query, doc[3:4]) == 100
+
+
+def test__scan_many_matches__scan(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """It returns the same scan results as scanning for each query."""
+    queries = [nlp("Kareem Abdul-Jabbar"), nlp("basketball"), nlp("player named")]
+    assert searcher._scan_many(adjust_example, queries, [30, 0, 50]) == [
+        searcher._scan(adjust_example, query, min_r1)
+        for query, min_r1 in zip(queries, [30, 0, 50])
+    ]
+
+
+def test_match_many_matches_match(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """It returns the same matches as matching each query with its kwargs."""
+    queries = [nlp("Kareem Abdul-Jabbar"), nlp("BASKETBALL"), nlp("xenomorph")]
+    kwargs = [
+        {"min_r2": 70},
+        {"ignore_case": False, "cluster": True},
+        {"fuzzy_func": "partial"},
+    ]
+    assert searcher.match_many(adjust_example, queries, kwargs) == [
+        searcher.match(adjust_example, query, **kwarg)
+        for query, kwarg in zip(queries, kwargs)
+    ]
+
+
+def test_match_many_raises_error_if_query_not_doc_obj(
+    searcher: FuzzySearcher, nlp: Language
+) -> None:
+    """It raises a TypeError if a query is not a doc."""
+    with pytest.raises(TypeError):
+        searcher.match_many(nlp("This is a doc"), ["Not a doc"], [{}])
+
+
+@pytest.mark.parametrize("fuzzy_func", ["simple", "quick", "quick_lev", "partial"])
+def test__window_scorer_length_pruning_keeps_scores(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc, fuzzy_func: str
+) -> None:
+    """It returns the same scores with min_r as compare() with min_r."""
+    query = nlp("Kareem Abdul-Jabbar")
+    scorer = searcher._window_scorer(adjust_example, query, fuzzy_func=fuzzy_func)
+    for min_r in (0, 40, 75):
+        for start in range(len(adjust_example)):
+            for end in range(start, len(adjust_example) + 1):
+                assert scorer(start, end, min_r) == searcher.compare(
+                    query,
+                    adjust_example[start:end],
+                    fuzzy_func=fuzzy_func,
+                    min_r=min_r,
+                )
+
+
+@pytest.mark.parametrize("min_r2", [50, 75, 90])
+def test_match_with_myers_backend_finds_every_span_reaching_min_r2(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc, min_r2: int
+) -> None:
+    """It returns the best non-overlapping spans of any length reaching min_r2."""
+    query = nlp("Kareem Abdul-Jabbar")
+    scorer = searcher._window_scorer(adjust_example, query)
+    spans = [
+        (start, end, scorer(start, end, min_r2))
+        for start in range(len(adjust_example))
+        for end in range(start + 1, len(adjust_example) + 1)
+    ]
+    expected = searcher._filter_overlapping_matches(
+        sorted([span for span in spans if span[2]], key=lambda x: (-x[2], x[0]))
+    )
+    assert (
+        searcher.match(adjust_example, query, min_r2=min_r2, backend="myers")
+        == expected
+    )
+
+
+def test_match_many_with_myers_backend_matches_match(
+    searcher: FuzzySearcher, nlp: Language, adjust_example: Doc
+) -> None:
+    """It returns the same matches as matching each query with its backend."""
+    queries = [nlp("Kareem Abdul-Jabbar"), nlp("BASKETBALL")]
+    kwargs = [{"backend": "myers", "top_k": 1}, {"ignore_case": False}]
+    assert searcher.match_many(adjust_example, queries, kwargs) == [
+        searcher.match(adjust_example, query, **kwarg)
+        for query, kwarg in zip(queries, kwargs)
+    ]
+
+
+def test_match_raises_error_with_unknown_backend(
+    searcher: FuzzySearcher, nlp: Language
+) -> None:
+    """It raises a ValueError if the backend is unknown."""
+    with pytest.raises(ValueError):
+        searcher.match(nlp("This is a doc"), nlp("doc"), backend="unknown")
+
+
+def test_match_raises_error_with_myers_backend_and_other_fuzzy_func(
+    searcher: FuzzySearcher, nlp: Language
+) -> None:
+    """It raises a ValueError if the myers backend gets another fuzzy_func."""
+    with pytest.raises(ValueError):
+        searcher.match(
+            nlp("This is a doc"), nlp("doc"), backend="myers", fuzzy_func="partial"
+        )
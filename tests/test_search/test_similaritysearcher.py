@@ -1,8 +1,11 @@
 """Tests for similaritysearcher module."""
+import numpy as np
 import pytest
+import spacy
 from spacy.language import Language
 
-from spaczz.search import SimilaritySearcher
+from spaczz.exceptions import MissingVectorsWarning
+from spaczz.search import _PhraseSearcher, SimilaritySearcher
 
 
 @pytest.fixture
@@ -23,3 +26,67 @@ def test_compare_returns_0_w_no_vector(
 ) -> None:
     """Checks compare returns 0 when vector does not exist for span/token."""
     assert searcher.compare(model("spaczz"), model("python")) == 0
+
+
+@pytest.fixture
+def vectors_nlp() -> Language:
+    """Blank pipeline with small random word vectors."""
+    nlp = spacy.blank("en")
+    rng = np.random.RandomState(0)
+    for word in ["the", "cat", "sat", "on", "a", "mat", "dog", "ran"]:
+        nlp.vocab.set_vector(word, rng.uniform(-1, 1, 8).astype("float32"))
+    return nlp
+
+
+def test__window_scorer_matches_compare(vectors_nlp: Language) -> None:
+    """It scores every window the same as comparing the window span."""
+    searcher = SimilaritySearcher(vectors_nlp.vocab)
+    doc = vectors_nlp("the cat sat on a mat and the dog ran")
+    for query in [vectors_nlp("cat sat"), vectors_nlp("dog"), vectors_nlp("and")]:
+        scorer = searcher._window_scorer(doc, query)
+        span_scorer = _PhraseSearcher._window_scorer(searcher, doc, query)
+        for start in range(len(doc)):
+            for end in range(start + 1, len(doc) + 1):
+                assert scorer(start, end) == span_scorer(start, end)
+                assert scorer(start, end, 50) == span_scorer(start, end, 50)
+
+
+def test__scan_many_matches__scan_with_compare(vectors_nlp: Language) -> None:
+    """It returns the same initial matches as comparing each window span."""
+    searcher = SimilaritySearcher(vectors_nlp.vocab)
+    doc = vectors_nlp("the cat sat on a mat and the dog ran")
+    queries = [vectors_nlp("cat sat"), vectors_nlp("dog"), vectors_nlp("a dog ran")]
+    min_r1s = [0, 50, 30]
+    assert searcher._scan_many(doc, queries, min_r1s) == [
+        _PhraseSearcher._scan(
+            searcher,
+            doc,
+            query,
+            min_r1,
+            scorer=_PhraseSearcher._window_scorer(searcher, doc, query),
+        )
+        for query, min_r1 in zip(queries, min_r1s)
+    ]
+
+
+def test__scan_many_rejects_negative_ratios_at_min_r1_0(
+    vectors_nlp: Language,
+) -> None:
+    """Windows with negative similarity do not pass a min_r1 of 0."""
+    searcher = SimilaritySearcher(vectors_nlp.vocab)
+    doc = vectors_nlp("the cat sat on a mat and the dog ran")
+    query = vectors_nlp("dog")
+    negative = {
+        pos for pos in range(len(doc)) if searcher.compare(query, doc[pos]) < 0
+    }
+    assert negative
+    (match_values,) = searcher._scan_many(doc, [query], [0])
+    assert match_values is not None
+    assert not negative & set(match_values)
+
+
+def test__vector_sums_is_none_without_vectors(nlp: Language) -> None:
+    """It falls back to comparing spans if the vocab has no vectors."""
+    with pytest.warns(MissingVectorsWarning):
+        searcher = SimilaritySearcher(nlp.vocab)
+    assert searcher._vector_sums(nlp("no vectors here")) is None
@@ -1,9 +1,12 @@
 """Tests for tokensearcher module."""
 import pytest
+from pytest_mock import MockerFixture
+import regex
 from spacy.language import Language
 from spacy.tokens import Doc
 
 from spaczz.search import TokenSearcher
+from spaczz.search.tokensearcher import TokenPredicate
 
 
 @pytest.fixture
@@ -20,6 +23,84 @@ def example(nlp: Language) -> Doc:
     )
 
 
+def test_fuzzy_compare_returns_0_below_min_r(searcher: TokenSearcher) -> None:
+    """It returns 0 if the ratio is below min_r."""
+    assert searcher.fuzzy_compare("spaczz", "spacy", min_r=73) == 73
+    assert searcher.fuzzy_compare("spaczz", "spacy", min_r=74) == 0
+
+
+def test_fuzzy_compare_skips_length_mismatches(
+    searcher: TokenSearcher, mocker: MockerFixture
+) -> None:
+    """It does not score strings whose lengths rule out reaching min_r."""
+    ratio = mocker.Mock(return_value=100.0)
+    mocker.patch.dict(searcher._fuzzy_funcs._fuzzy_funcs, {"simple": ratio})
+    assert searcher.fuzzy_compare("a", "abcdefgh", min_r=50) == 0
+    ratio.assert_not_called()
+
+
+def test_regex_compare_accepts_compiled_patterns(searcher: TokenSearcher) -> None:
+    """Compiled patterns match the same as pattern strings."""
+    pattern = "(sql){i<=3}"
+    assert searcher.regex_compare("SEQUEL", regex.compile(pattern), True)
+    assert searcher.regex_compare("SEQUEL", pattern, True)
+    assert not searcher.regex_compare("SEQUEL", regex.compile(pattern))
+
+
+def test_compile_pattern_resolves_defaults(searcher: TokenSearcher) -> None:
+    """Tokens without MIN_R or FUZZY_FUNC take the given defaults."""
+    predicates = searcher.compile_pattern(
+        [{"LOWER": {"FUZZY": "sql"}}, {"TEXT": {"FREGEX": "(db)"}}, {"ORTH": "a"}],
+        min_r=80,
+        fuzzy_func="quick",
+    )
+    assert predicates == [
+        TokenPredicate(True, "FUZZY", "sql", 80, "quick"),
+        TokenPredicate(False, "FREGEX", "(db)", None, None),
+        None,
+    ]
+
+
+def test_predicate_func_agrees_with_compare(searcher: TokenSearcher) -> None:
+    """Predicate functions match the texts the compare methods accept."""
+    fuzzy, fregex = searcher.compile_pattern(
+        [{"LOWER": {"FUZZY": "access"}}, {"LOWER": {"FREGEX": "(sql){i<=3}"}}]
+    )
+    fuzzy_func = searcher.predicate_func(fuzzy)
+    fregex_func = searcher.predicate_func(fregex)
+    for text in ["ACESS", "acces", "access", "SEQUEL", "SQL", "manager"]:
+        assert fuzzy_func(text) == bool(
+            searcher.fuzzy_compare(text, "access", True, min_r=75)
+        )
+        assert fregex_func(text) == searcher.regex_compare(text, "(sql){i<=3}", True)
+
+
+def test_anchor_index_prefers_selective_tokens(searcher: TokenSearcher) -> None:
+    """FUZZY tokens with higher MIN_R and longer texts anchor the pattern."""
+    pattern = [
+        {"TEXT": {"FREGEX": "(database){e<=1}"}},
+        {"LOWER": {"FUZZY": "sql", "MIN_R": 90}},
+        {"POS": "NOUN"},
+        {"LOWER": {"FUZZY": "access", "MIN_R": 90}},
+    ]
+    assert searcher.anchor_index(searcher.compile_pattern(pattern)) == 3
+    assert searcher.anchor_index(searcher.compile_pattern([{"POS": "NOUN"}])) is None
+
+
+def test_match_finds_anchored_windows_at_doc_edges(
+    searcher: TokenSearcher, example: Doc
+) -> None:
+    """Windows around anchor matches at either end of the doc are found."""
+    assert searcher.match(
+        example, [{"LOWER": {"FUZZY": "the"}}, {"LOWER": {"FUZZY": "manager"}}]
+    ) == [[("LOWER", "The"), ("LOWER", "manager")]]
+    assert searcher.match(
+        example, [{"POS": "NOUN"}, {"TEXT": {"FREGEX": r"databasE\."}}]
+    ) == [[None, ("TEXT", "databasE.")]]
+    short_pattern = [{"LOWER": {"FUZZY": "the"}}, {"POS": "NOUN"}, {}]
+    assert searcher.match(example[:2].as_doc(), short_pattern) == []
+
+
 def test_match_lower(searcher: TokenSearcher, example: Doc) -> None:
     """The searcher with lower-cased text is working as intended."""
     assert searcher.match(
@@ -53,6 +134,31 @@ def test_match_multiple_matches(searcher: TokenSearcher, example: Doc) -> None:
     ]
 
 
+def test_match_drops_duplicates_in_first_seen_order(
+    searcher: TokenSearcher, example: Doc
+) -> None:
+    """Repeated matches are returned once, in the order first found."""
+    assert searcher.match(example, [{"TEXT": {"FUZZY": "SQL"}}, {"ORTH": "x"}]) == [
+        [("TEXT", "SQL"), None]
+    ]
+    assert searcher.match(example, [{"LOWER": {"FREGEX": "(sql|the)"}}]) == [
+        [("LOWER", "The")],
+        [("LOWER", "SQL")],
+        [("LOWER", "the")],
+    ]
+
+
+def test_match_only_compares_term_candidates(
+    searcher: TokenSearcher, example: Doc
+) -> None:
+    """Indexed pattern tokens are only compared with their candidate texts."""
+    pattern = [{"LOWER": {"FUZZY": "access"}}]
+    term_candidates = {(True, "access"): {"acces"}}
+    assert searcher.match(example, pattern, term_candidates=term_candidates) == [
+        [("LOWER", "acces")]
+    ]
+
+
 def test_no_matches(searcher: TokenSearcher, example: Doc) -> None:
     """No matches returns empty list."""
     assert searcher.match(example, [{"TEXT": {"FUZZY": "MongoDB"}}]) == []